@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Atomic file writes, shared by both tools.
+
+A file is written through a temporary file next to it, which then replaces it: an interrupted
+run leaves either the old or the new file. The replaced file keeps its permissions and a new
+file gets the usual 0644 mode rather than the private mode of the temporary file, so that state
+files such as snapshots can be shared.
+"""
+
+import os
+import shutil
+import tempfile
+from typing import Callable, Optional, TextIO
+
+NEW_FILE_MODE = 0o644
+
+
+def write_atomically(filepath: str, write: Callable[[TextIO], Optional[bool]]) -> bool:
+    """
+    Write a file atomically. `write` fills the temporary file and may return False to abort
+    the replacement; returns whether the file was replaced.
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    name = os.path.basename(filepath)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as target:
+            complete = write(target) is not False
+            target.flush()
+            os.fsync(target.fileno())
+        if not complete:
+            os.unlink(tmp_path)
+            return False
+        if os.path.exists(filepath):
+            shutil.copymode(filepath, tmp_path)
+        else:
+            os.chmod(tmp_path, NEW_FILE_MODE)
+        os.replace(tmp_path, filepath)
+        return True
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
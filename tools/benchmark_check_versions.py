@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Load/latency benchmark of check_versions.py against the local fake GitHub server.
+
+For each BOM size, a synthetic BOM is verified and the wall time, the number of requests
+received by the server and the p50/p95 client-side request latency are reported.
+
+Usage:
+    python benchmark_check_versions.py [--sizes 30,100,300,1000] [--concurrency N]
+                                       [--backend rest|graphql] [--latency MS] [--jitter MS]
+                                       [--error-rate RATE] [--rate-limit N] [--cache]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from check_versions import (  # noqa: E402
+    DEFAULT_CONCURRENCY, DependencyChecker, PooledTransport, RequestScheduler, ResponseCache
+)
+from fake_github_server import FakeGitHub, FakeGitHubServer, make_changelog  # noqa: E402
+
+DEFAULT_SIZES = "30,100,300,1000"
+
+
+def make_bom(size: int) -> Tuple[List[Tuple[str, str, str]], Dict[str, Dict]]:
+    """
+    Build a synthetic BOM of `size` dependencies and the matching fixtures.
+    One dependency out of ten is outdated and one out of ten has unreleased changes.
+    """
+    dependencies = []
+    fixtures = {}
+    for i in range(size):
+        artifact_id = f"keyple-bench{i:04d}-java-lib"
+        version = f"1.{i % 7}.{i % 3}"
+        latest = f"1.{i % 7}.{i % 3 + 1}" if i % 10 == 3 else version
+        unreleased = "### Added\n- Pending change.\n" if i % 10 == 7 else ""
+        dependencies.append(("org.eclipse.keyple", artifact_id, version))
+        fixtures[f"eclipse-keyple/{artifact_id}"] = {
+            'tag_name': latest,
+            'changelog': make_changelog(latest, unreleased),
+        }
+    return dependencies, fixtures
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_benchmark(size: int, args: argparse.Namespace) -> Dict[str, float]:
+    """Verify a synthetic BOM against a fresh fake server and return the measures."""
+    dependencies, fixtures = make_bom(size)
+    github = FakeGitHub(fixtures, args.latency / 1000, args.jitter / 1000, args.error_rate,
+                        args.rate_limit, seed=size)
+    server = FakeGitHubServer(github).start()
+    cache_dir = tempfile.mkdtemp(prefix="bench-cache-") if args.cache else None
+    try:
+        latencies: List[float] = []
+        lock = threading.Lock()
+
+        def record_latency(response, *_args, **_kwargs):
+            with lock:
+                latencies.append(response.elapsed.total_seconds())
+
+        def make_checker() -> DependencyChecker:
+            cache = ResponseCache(cache_dir) if cache_dir else None
+            checker = DependencyChecker("benchmark", cache, RequestScheduler(), server.url,
+                                        transport=PooledTransport(2 * args.concurrency))
+            checker.session.hooks['response'].append(record_latency)
+            return checker
+
+        if args.cache:
+            # Warm the cache with a first run, then measure the repeated run
+            warm_checker = make_checker()
+            with contextlib.redirect_stdout(io.StringIO()):
+                warm_checker.check_dependencies(dependencies, args.concurrency)
+            warm_checker.cache.save()
+            github.reset_statistics()
+            latencies.clear()
+
+        checker = make_checker()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if args.backend == "graphql":
+                checker.prefetch_graphql(dependencies)
+            results = checker.check_dependencies(dependencies, args.concurrency)
+        wall_time = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+        if cache_dir:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    return {
+        'size': size,
+        'wall_time': wall_time,
+        'requests': github.requests,
+        'p50': percentile(latencies, 0.50) * 1000,
+        'p95': percentile(latencies, 0.95) * 1000,
+        'errors': sum(1 for result in results if result['error']),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark check_versions.py against a local fake GitHub API.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"comma-separated BOM sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("-j", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"number of dependencies verified in parallel (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--backend", choices=["rest", "graphql"], default="rest",
+                        help="GitHub API backend (default: rest)")
+    parser.add_argument("--latency", type=float, default=50.0, help="server latency in ms (default: 50)")
+    parser.add_argument("--jitter", type=float, default=20.0, help="random extra latency in ms (default: 20)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of answers replaced by a 502 error (default: 0)")
+    parser.add_argument("--rate-limit", type=int, help="core rate-limit quota (default: unlimited)")
+    parser.add_argument("--cache", action="store_true",
+                        help="measure a repeated run with a warm HTTP cache")
+    args = parser.parse_args()
+    try:
+        args.sizes = [int(size) for size in args.sizes.split(',')]
+    except ValueError:
+        parser.error("--sizes must be a comma-separated list of integers")
+    return args
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    print("=" * 80)
+    print("CHECK_VERSIONS BENCHMARK")
+    print("=" * 80)
+    print(f"  Backend: {args.backend}, concurrency: {args.concurrency}, "
+          f"latency: {args.latency:.0f}±{args.jitter:.0f} ms, error rate: {args.error_rate:.0%}, "
+          f"cache: {'warm' if args.cache else 'off'}")
+    print("-" * 80)
+    print(f"  {'Deps':>6} | {'Wall time':>10} | {'Requests':>8} | {'p50':>9} | {'p95':>9} | {'Errors':>6}")
+    print("-" * 80)
+    for size in args.sizes:
+        measures = run_benchmark(size, args)
+        print(f"  {measures['size']:>6} | {measures['wall_time']:>9.2f}s | {measures['requests']:>8} | "
+              f"{measures['p50']:>7.1f}ms | {measures['p95']:>7.1f}ms | {measures['errors']:>6}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scaling benchmark of the update_changelog.py parsers and generators.
+
+Synthetic build.gradle.kts files (10 to 10,000 constraints, one library out of five being a KMP
+library with its variants) and synthetic CHANGELOGs (10 to 5,000 sections) are generated, then
+each stage is timed (best of several runs) and its peak memory measured with tracemalloc:
+BuildGradleParser.parse, ChangelogParser.parse_latest_version,
+ChangelogGenerator.generate_new_section, update_reference_links and write_updated_changelog.
+
+The measures are compared with a stored baseline: the run fails when a stage is slower or uses
+more memory than its baseline beyond the tolerances. The reference baseline committed next to this
+script is used unless --baseline or the BENCHMARK_BASELINE environment variable names another one,
+such as a baseline measured on the CI machines.
+
+Usage:
+    python benchmark_update_changelog.py [--bom-sizes 10,100,1000,10000]
+                                         [--changelog-sizes 10,100,1000,5000] [--repeat N]
+                                         [--baseline FILE] [--update-baseline]
+                                         [--time-tolerance RATIO] [--memory-tolerance RATIO]
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bom_model  # noqa: E402
+from changelog_index import ChangelogEntry  # noqa: E402
+from update_changelog import (  # noqa: E402
+    BuildGradleParser, ChangelogGenerator, ChangelogParser, Dependency, HistoryBackfill
+)
+
+DEFAULT_BOM_SIZES = "10,100,1000,10000"
+DEFAULT_CHANGELOG_SIZES = "10,100,1000,5000"
+DEFAULT_REPEAT = 5
+REFERENCE_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_update_changelog_baseline.json")
+BASELINE_ENV = "BENCHMARK_BASELINE"
+BASELINE_FORMAT_VERSION = 1
+
+# Sections of the CHANGELOG of the BOM size cases, and constraints of the BOM of the CHANGELOG size cases
+CASE_SECTIONS = 10
+CASE_CONSTRAINTS = 40
+# One library out of KMP_LIBRARY_RATIO is a KMP library
+KMP_LIBRARY_RATIO = 5
+# At each revision, the libraries whose index matches the revision modulo BUMP_PERIOD get a patch bump
+BUMP_PERIOD = 10
+
+# Differences below these floors are measurement noise, never regressions
+DEFAULT_TIME_TOLERANCE = 0.5
+DEFAULT_MEMORY_TOLERANCE = 0.2
+MIN_TIME_DELTA = 0.002
+MIN_MEMORY_DELTA = 64 * 1024
+
+FIRST_SECTION_DATE = date(2020, 1, 1)
+
+
+def library_version(index: int, revision: int) -> str:
+    """Version of the library `index` at a BOM revision: one library out of BUMP_PERIOD is bumped per revision."""
+    bumps = (revision - index % BUMP_PERIOD) // BUMP_PERIOD + 1 if revision >= index % BUMP_PERIOD else 0
+    return f"{1 + index % 3}.{index % 5}.{bumps}"
+
+
+def make_bom(size: int, revision: int) -> str:
+    """
+    Build a synthetic build.gradle.kts of `size` constraints at a revision. The libraries are
+    spread over the categories in contiguous blocks; every KMP library comes with its variants.
+    """
+    libraries: List[Tuple[str, List[str]]] = []
+    count = 0
+    while count < size:
+        index = len(libraries)
+        if index % KMP_LIBRARY_RATIO == KMP_LIBRARY_RATIO - 1:
+            base = f"keyple-bench{index:05d}-kmp-lib"
+            artifacts = [base] + [base + suffix for suffix in bom_model.KMP_VARIANT_SUFFIXES]
+        else:
+            artifacts = [f"keyple-bench{index:05d}-java-lib"]
+        artifacts = artifacts[:size - count]
+        libraries.append((library_version(index, revision), artifacts))
+        count += len(artifacts)
+
+    categories = list(bom_model.CATEGORY_MAPPING)
+    lines = ["dependencies {", "  constraints {"]
+    current_category = None
+    for index, (version, artifacts) in enumerate(libraries):
+        category = categories[index * len(categories) // len(libraries)]
+        if category != current_category:
+            lines.append(f"    // {category}")
+            current_category = category
+        for artifact_id in artifacts:
+            lines.append(f'    api("org.eclipse.keyple:{artifact_id}:{version}")')
+    lines.extend(["  }", "}", ""])
+    return "\n".join(lines)
+
+
+def make_changelog(path: str, constraints: int, sections: int) -> None:
+    """Write a synthetic CHANGELOG of `sections` sections, one per revision of a BOM of `constraints` constraints."""
+    generator = ChangelogGenerator(path)
+    history = []
+    old_entries: Dict[str, ChangelogEntry] = {}
+    for revision in range(sections):
+        version = (FIRST_SECTION_DATE + timedelta(days=revision)).strftime("%Y.%m.%d")
+        dependencies = BuildGradleParser.parse_content(make_bom(constraints, revision))
+        section, _ = generator.generate_new_section(version, dependencies, old_entries)
+        history.append((version, section, dependencies))
+        old_entries = {
+            dep.artifact_id: ChangelogEntry(dep.artifact_id, dep.version, "", "", dep.category)
+            for dep in dependencies
+        }
+    HistoryBackfill().write(path, history)
+
+
+def measure(stage: Callable[[], object], repeat: int, setup: Optional[Callable[[], None]] = None) -> Tuple[float, int]:
+    """Return the best time of `repeat` runs of a stage and its peak memory, measured in a separate run."""
+    best = float('inf')
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        stage()
+        best = min(best, time.perf_counter() - start)
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        stage()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_case(constraints: int, sections: int, repeat: int, work_dir: str) -> Dict[str, Tuple[float, int]]:
+    """Measure every stage on a BOM of `constraints` constraints and a CHANGELOG of `sections` sections."""
+    bom_path = os.path.join(work_dir, "build.gradle.kts")
+    changelog_path = os.path.join(work_dir, "CHANGELOG.md")
+    with open(bom_path, 'w', encoding='utf-8') as f:
+        f.write(make_bom(constraints, sections))
+    make_changelog(changelog_path, constraints, sections)
+    with open(changelog_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # The inputs of each stage are the outputs of the previous ones
+    dependencies: List[Dependency] = BuildGradleParser(bom_path).parse()
+    old_version, old_entries = ChangelogParser(changelog_path).parse_latest_version()
+    new_version = (FIRST_SECTION_DATE + timedelta(days=sections)).strftime("%Y.%m.%d")
+    generator = ChangelogGenerator(changelog_path)
+    new_section, _ = generator.generate_new_section(new_version, dependencies, old_entries)
+
+    return {
+        "parse BOM": measure(lambda: BuildGradleParser(bom_path).parse(), repeat, bom_model.clear_cache),
+        "parse CHANGELOG": measure(lambda: ChangelogParser(changelog_path).parse_latest_version(), repeat),
+        "generate section": measure(
+            lambda: generator.generate_new_section(new_version, dependencies, old_entries), repeat
+        ),
+        "update reference links": measure(
+            lambda: generator.update_reference_links(content, new_version, dependencies, old_entries), repeat
+        ),
+        "write CHANGELOG": measure(
+            lambda: generator.write_updated_changelog(
+                io.StringIO(), new_version, new_section, dependencies, old_entries
+            ),
+            repeat
+        ),
+    }
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Dict[str, float]]]:
+    """Load the baseline measures by "case/stage", or None if there is no baseline."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    if not isinstance(data, dict) or data.get('format') != BASELINE_FORMAT_VERSION:
+        raise ValueError(f"{path} is not a benchmark baseline of format {BASELINE_FORMAT_VERSION}")
+    return data['measures']
+
+
+def save_baseline(path: str, measures: Dict[str, Dict[str, float]]) -> None:
+    """Write the measures as the new baseline."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'format': BASELINE_FORMAT_VERSION, 'measures': measures}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def regressions_of(measure: Dict[str, float], baseline: Optional[Dict[str, float]],
+                   args: argparse.Namespace) -> List[str]:
+    """Return the regressions of a stage measure against its baseline."""
+    if baseline is None:
+        return []
+    regressions = []
+    time_delta = measure['time'] - baseline['time']
+    if time_delta > MIN_TIME_DELTA and measure['time'] > baseline['time'] * (1 + args.time_tolerance):
+        regressions.append(f"time {baseline['time'] * 1000:.1f}ms → {measure['time'] * 1000:.1f}ms")
+    memory_delta = measure['memory'] - baseline['memory']
+    if memory_delta > MIN_MEMORY_DELTA and measure['memory'] > baseline['memory'] * (1 + args.memory_tolerance):
+        regressions.append(f"memory {format_size(baseline['memory'])} → {format_size(measure['memory'])}")
+    return regressions
+
+
+def format_size(size: float) -> str:
+    """Format a size in bytes as KB or MB."""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f}MB"
+    return f"{size / 1024:.1f}KB"
+
+
+def parse_sizes(parser: argparse.ArgumentParser, value: str, option: str) -> List[int]:
+    """Parse a comma-separated list of sizes."""
+    try:
+        return [int(size) for size in value.split(',') if size]
+    except ValueError:
+        parser.error(f"{option} must be a comma-separated list of integers")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the update_changelog.py parsers and generators.")
+    parser.add_argument("--bom-sizes", default=DEFAULT_BOM_SIZES,
+                        help=f"comma-separated numbers of BOM constraints, each with a CHANGELOG of "
+                             f"{CASE_SECTIONS} sections (default: {DEFAULT_BOM_SIZES})")
+    parser.add_argument("--changelog-sizes", default=DEFAULT_CHANGELOG_SIZES,
+                        help=f"comma-separated numbers of CHANGELOG sections, each with a BOM of "
+                             f"{CASE_CONSTRAINTS} constraints (default: {DEFAULT_CHANGELOG_SIZES})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"timed runs per stage, the best one is kept (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--baseline", default=os.environ.get(BASELINE_ENV, REFERENCE_BASELINE),
+                        help=f"baseline file (default: ${BASELINE_ENV}, else the committed reference "
+                             f"{REFERENCE_BASELINE})")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write the measures to the baseline file instead of comparing them")
+    parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE,
+                        help=f"accepted slowdown ratio of a stage (default: {DEFAULT_TIME_TOLERANCE})")
+    parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE,
+                        help=f"accepted peak memory increase ratio of a stage (default: {DEFAULT_MEMORY_TOLERANCE})")
+    args = parser.parse_args()
+    args.bom_sizes = parse_sizes(parser, args.bom_sizes, "--bom-sizes")
+    args.changelog_sizes = parse_sizes(parser, args.changelog_sizes, "--changelog-sizes")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    return args
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    baseline = None
+    if not args.update_baseline:
+        try:
+            baseline = load_baseline(args.baseline)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    cases = [(f"bom {size}", size, CASE_SECTIONS) for size in args.bom_sizes]
+    cases += [(f"changelog {size}", CASE_CONSTRAINTS, size) for size in args.changelog_sizes]
+
+    print("=" * 80)
+    print("UPDATE_CHANGELOG BENCHMARK")
+    print("=" * 80)
+    print(f"  Best of {args.repeat} runs, baseline: "
+          f"{args.baseline if baseline is not None else 'none'}")
+    print("-" * 80)
+    print(f"  {'Case':<16} {'Stage':<24} {'Time':>10} {'Peak mem':>10} {'Baseline':>10}  Regression")
+    print("-" * 80)
+    measures: Dict[str, Dict[str, float]] = {}
+    regressions: List[str] = []
+    work_dir = tempfile.mkdtemp(prefix="bench-changelog-")
+    try:
+        for label, constraints, sections in cases:
+            for stage, (best, peak) in run_case(constraints, sections, args.repeat, work_dir).items():
+                key = f"{label}/{stage}"
+                measures[key] = {'time': best, 'memory': peak}
+                reference = baseline.get(key) if baseline is not None else None
+                found = regressions_of(measures[key], reference, args)
+                regressions.extend(f"{key}: {regression}" for regression in found)
+                reference_time = f"{reference['time'] * 1000:.2f}ms" if reference else "-"
+                print(f"  {label:<16} {stage:<24} {best * 1000:>8.2f}ms {format_size(peak):>10} "
+                      f"{reference_time:>10}  {'✗ ' + '; '.join(found) if found else ''}".rstrip())
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print("=" * 80)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, measures)
+        print(f"  ✓ Baseline of {len(measures)} measures written to {args.baseline}")
+    elif baseline is None:
+        print("  ⚠ No baseline to compare with, create one with --update-baseline")
+    elif regressions:
+        print(f"  ✗ {len(regressions)} regressions:")
+        for regression in regressions:
+            print(f"    {regression}")
+        sys.exit(1)
+    else:
+        print("  ✓ No regression against the baseline")
+
+
+if __name__ == "__main__":
+    main()
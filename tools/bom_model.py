@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Shared model of the BOM constraints declared in build.gradle.kts.
+
+The constraints block is parsed in a single pass with precompiled patterns. Each api(...) line
+becomes a Constraint carrying its category and, for KMP library variants, the base library
+it belongs to. Parsed models are cached by file mtime/size and by content. The contents of
+past revisions are read from the local git repository.
+"""
+
+import os
+import re
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+CATEGORY_MAPPING = {
+    "Keypop": "**Keypop Dependencies**",
+    "Keyple core": "**Keyple Core**",
+    "Keyple distributed": "**Keyple Distributed**",
+    "Keyple interop": "**Keyple Interop**",
+    "Keyple card extensions": "**Keyple Card Extensions**",
+    "Keyple reader plugins": "**Keyple Reader Plugins**",
+}
+
+# Suffixes of the KMP library variants, which are grouped under their base library
+KMP_VARIANT_SUFFIXES = [
+    "-jvm", "-android", "-iosarm64", "-iossimulatorarm64", "-iosx64"
+]
+
+CONSTRAINTS_PATTERN = re.compile(r'constraints\s*\{(.*?)\}', re.DOTALL)
+API_PATTERN = re.compile(r'api\("([^:]+):([^:]+):([^"]+)"\)')
+KMP_VARIANT_PATTERN = re.compile(
+    r'(.+?)(' + '|'.join(re.escape(suffix) for suffix in KMP_VARIANT_SUFFIXES) + r')$'
+)
+
+
+@dataclass
+class Constraint:
+    """An api(...) constraint of the BOM."""
+    group_id: str
+    artifact_id: str
+    version: str
+    category: Optional[str]
+    base_artifact_id: str
+    is_variant: bool
+    line_number: int
+
+    @property
+    def coordinates(self) -> str:
+        return f"{self.group_id}:{self.artifact_id}:{self.version}"
+
+
+@dataclass
+class BomModel:
+    """All constraints of a build.gradle.kts, in file order."""
+    constraints: List[Constraint] = field(default_factory=list)
+    # Base artifact ID -> its KMP variants, in file order
+    variants: Dict[str, List[Constraint]] = field(default_factory=dict)
+
+    @property
+    def libraries(self) -> List[Constraint]:
+        """The categorized constraints that are not KMP variants, in file order."""
+        return [c for c in self.constraints if not c.is_variant and c.category]
+
+    def as_tuples(self) -> List[Tuple[str, str, str]]:
+        """All constraints as (groupId, artifactId, version) tuples."""
+        return [(c.group_id, c.artifact_id, c.version) for c in self.constraints]
+
+
+def split_kmp_variant(artifact_id: str) -> Tuple[str, bool]:
+    """Return (base artifact ID, is_variant) for an artifact ID."""
+    match = KMP_VARIANT_PATTERN.match(artifact_id)
+    if match:
+        return match.group(1), True
+    return artifact_id, False
+
+
+@lru_cache(maxsize=32)
+def parse_bom_content(content: str) -> BomModel:
+    """Parse the content of a build.gradle.kts in a single pass over its constraints block."""
+    model = BomModel()
+    constraints_match = CONSTRAINTS_PATTERN.search(content)
+    if not constraints_match:
+        return model
+
+    first_line = content.count('\n', 0, constraints_match.start(1)) + 1
+    current_category = None
+    for offset, line in enumerate(constraints_match.group(1).split('\n')):
+        line = line.strip()
+
+        # Check for category comment
+        if line.startswith('//'):
+            category_name = line.lstrip('/').strip()
+            current_category = CATEGORY_MAPPING.get(category_name, category_name)
+            continue
+
+        api_match = API_PATTERN.match(line)
+        if not api_match:
+            continue
+        group_id, artifact_id, version = api_match.groups()
+        base_artifact_id, is_variant = split_kmp_variant(artifact_id)
+        constraint = Constraint(
+            group_id=group_id,
+            artifact_id=artifact_id,
+            version=version,
+            category=current_category,
+            base_artifact_id=base_artifact_id,
+            is_variant=is_variant,
+            line_number=first_line + offset
+        )
+        model.constraints.append(constraint)
+        if is_variant:
+            model.variants.setdefault(base_artifact_id, []).append(constraint)
+
+    return model
+
+
+def read_git_contents(revisions: List[str], filepath: str = "build.gradle.kts",
+                      repo_dir: str = ".") -> List[Optional[str]]:
+    """
+    Read the content of a file at each git revision (None if the revision or the file is
+    missing) with a single `git cat-file --batch` process.
+    """
+    request = ''.join(f"{revision}:{filepath}\n" for revision in revisions)
+    output = subprocess.run(
+        ["git", "cat-file", "--batch"], cwd=repo_dir, input=request.encode('utf-8'),
+        stdout=subprocess.PIPE, check=True
+    ).stdout
+    contents: List[Optional[str]] = []
+    position = 0
+    for _ in revisions:
+        header_end = output.index(b'\n', position)
+        header = output[position:header_end].split()
+        position = header_end + 1
+        if len(header) < 3 or header[1] != b'blob':
+            contents.append(None)
+            continue
+        size = int(header[2])
+        contents.append(output[position:position + size].decode('utf-8'))
+        # Skip the content and its trailing newline
+        position += size + 1
+    return contents
+
+
+_file_cache: Dict[str, Tuple[Tuple[int, int], BomModel]] = {}
+_file_cache_lock = threading.Lock()
+
+
+def load_bom(filepath: str, use_cache: bool = True) -> BomModel:
+    """
+    Load the model of a build.gradle.kts file.
+    With `use_cache`, the file is parsed again only when its mtime or size changed.
+    """
+    stat = os.stat(filepath)
+    key = os.path.abspath(filepath)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    if use_cache:
+        with _file_cache_lock:
+            cached = _file_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        model = parse_bom_content(f.read())
+    if use_cache:
+        with _file_cache_lock:
+            _file_cache[key] = (signature, model)
+    return model
+
+
+def clear_cache() -> None:
+    """Forget the parsed models, so that the next loads parse their files again."""
+    parse_bom_content.cache_clear()
+    with _file_cache_lock:
+        _file_cache.clear()
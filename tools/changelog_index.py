@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index of all the release sections of the BOM CHANGELOG.md, with per-artifact queries.
+
+The file is scanned once: every `## [YYYY.MM.DD]` section is recorded with its byte offsets
+and its table entries. An optional sidecar file keeps the index between runs, so that repeated
+queries do not parse the CHANGELOG again while it is unchanged.
+
+Usage:
+    python changelog_index.py history ARTIFACT
+    python changelog_index.py first-shipped ARTIFACT VERSION
+    python changelog_index.py diff BOM_VERSION_A BOM_VERSION_B
+    python changelog_index.py versions
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from atomic_file import write_atomically
+
+VERSION_HEADING_PATTERN = re.compile(r'## \[(\d{4}\.\d{2}\.\d{2})\]')
+UNRELEASED_HEADING_PATTERN = re.compile(r'## \[Unreleased\]')
+SECTION_HEADING_PREFIX = '## ['
+LINKS_START_PATTERN = re.compile(r'\[Unreleased\]:')
+LINK_NAME_PATTERN = re.compile(r'\[([^\]]+)\]')
+
+REMOVED_STATUS = "❌"
+INDEX_FORMAT_VERSION = 1
+
+
+@dataclass
+class ChangelogEntry:
+    """Represents an entry in the changelog."""
+    name: str
+    version: str
+    status: str
+    prev_version: str
+    category: str = ""
+
+
+@dataclass
+class ReleaseSection:
+    """A `## [YYYY.MM.DD]` section of the CHANGELOG, with its byte offsets."""
+    version: str
+    start: int
+    end: int
+    entries: Dict[str, ChangelogEntry] = field(default_factory=dict)
+
+
+def parse_table(lines: List[str]) -> Dict[str, ChangelogEntry]:
+    """Parse the component table of a release section."""
+    entries = {}
+    in_table = False
+    current_category = ""
+
+    for line in lines:
+        if line.startswith('|') and '---' in line:
+            in_table = True
+            continue
+
+        if in_table and line.startswith('|'):
+            # Parse table row
+            cells = [cell.strip() for cell in line.split('|')[1:-1]]
+            if len(cells) >= 2:
+                name = cells[0].strip()
+
+                # Check if this is a category header
+                if '**' in name:
+                    current_category = name
+                    continue
+
+                # Skip empty rows
+                if not name or not cells[1].strip():
+                    continue
+
+                dep_version = cells[1].strip('`').strip()
+                status = cells[2].strip() if len(cells) > 2 else ''
+                prev_version = cells[3].strip('`').strip() if len(cells) > 3 else ''
+
+                # Extract artifact name from markdown link if present
+                link_match = LINK_NAME_PATTERN.match(name)
+                if link_match:
+                    name = link_match.group(1)
+
+                if name and dep_version:
+                    entries[name] = ChangelogEntry(name, dep_version, status, prev_version, current_category)
+
+    return entries
+
+
+class ChangelogIndex:
+    """All the release sections of a CHANGELOG.md, newest first."""
+
+    def __init__(self, sections: List[ReleaseSection], unreleased_start: Optional[int] = None,
+                 links_start: Optional[int] = None, size: int = 0):
+        self.sections = sections
+        # Byte offsets of the `## [Unreleased]` heading and of the reference links
+        self.unreleased_start = unreleased_start
+        self.links_start = links_start
+        self.size = size
+        self._by_version = {section.version: section for section in sections}
+
+    @classmethod
+    def parse(cls, data: bytes) -> "ChangelogIndex":
+        """Index a CHANGELOG.md content in a single pass over its lines."""
+        return cls.parse_lines(data.splitlines(keepends=True))
+
+    @classmethod
+    def parse_lines(cls, raw_lines: Iterable[bytes], max_sections: Optional[int] = None) -> "ChangelogIndex":
+        """
+        Index CHANGELOG.md lines, kept with their line endings. With `max_sections`, the scan
+        stops after the newest `max_sections` release sections, leaving the rest unread.
+        """
+        sections: List[ReleaseSection] = []
+        unreleased_start = None
+        links_start = None
+        current: Optional[ReleaseSection] = None
+        current_lines: List[str] = []
+        offset = 0
+
+        def close_section(end: int) -> None:
+            current.end = end
+            current.entries = parse_table(current_lines)
+            sections.append(current)
+
+        for raw_line in raw_lines:
+            line = raw_line.decode('utf-8').rstrip('\r\n')
+            if line.startswith(SECTION_HEADING_PREFIX) or (links_start is None and LINKS_START_PATTERN.match(line)):
+                if current is not None:
+                    close_section(offset)
+                    current, current_lines = None, []
+                    if len(sections) == max_sections:
+                        break
+                version_match = VERSION_HEADING_PATTERN.match(line)
+                if version_match and unreleased_start is not None and links_start is None:
+                    current = ReleaseSection(version_match.group(1), offset, offset)
+                elif UNRELEASED_HEADING_PATTERN.match(line) and unreleased_start is None:
+                    unreleased_start = offset
+                elif LINKS_START_PATTERN.match(line):
+                    links_start = offset
+            elif current is not None:
+                current_lines.append(line)
+            offset += len(raw_line)
+
+        if current is not None:
+            close_section(offset)
+        return cls(sections, unreleased_start, links_start, offset)
+
+    @classmethod
+    def load(cls, filepath: str, use_sidecar: bool = True) -> "ChangelogIndex":
+        """
+        Index a CHANGELOG.md file.
+        With `use_sidecar`, the index is read from the sidecar file when it matches the file
+        mtime and size, and written to it otherwise.
+        """
+        stat = os.stat(filepath)
+        signature = [stat.st_mtime_ns, stat.st_size]
+        sidecar = sidecar_path(filepath)
+        if use_sidecar:
+            index = cls._read_sidecar(sidecar, signature)
+            if index is not None:
+                return index
+
+        with open(filepath, 'rb') as f:
+            index = cls.parse(f.read())
+        if use_sidecar:
+            try:
+                index._write_sidecar(sidecar, signature)
+            except OSError:
+                pass
+        return index
+
+    @classmethod
+    def read_latest(cls, filepath: str) -> Optional[ReleaseSection]:
+        """Return the newest release section of a CHANGELOG.md file, reading the file only up to its end."""
+        with open(filepath, 'rb') as f:
+            return cls.parse_lines(f, max_sections=1).latest
+
+    @classmethod
+    def _read_sidecar(cls, path: str, signature: List[int]) -> Optional["ChangelogIndex"]:
+        """Read a sidecar index, or return None if it is missing, outdated or corrupted."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data['format'] != INDEX_FORMAT_VERSION or data['signature'] != signature:
+                return None
+            sections = [
+                ReleaseSection(
+                    section['version'], section['start'], section['end'],
+                    {name: ChangelogEntry(**entry) for name, entry in section['entries'].items()}
+                )
+                for section in data['sections']
+            ]
+            return cls(sections, data['unreleased_start'], data['links_start'], data['size'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_sidecar(self, path: str, signature: List[int]) -> None:
+        """Write the index to a sidecar file atomically."""
+        data = {
+            'format': INDEX_FORMAT_VERSION,
+            'signature': signature,
+            'unreleased_start': self.unreleased_start,
+            'links_start': self.links_start,
+            'size': self.size,
+            'sections': [asdict(section) for section in self.sections],
+        }
+        write_atomically(path, lambda f: json.dump(data, f, ensure_ascii=False))
+
+    @property
+    def latest(self) -> Optional[ReleaseSection]:
+        """The newest release section."""
+        return self.sections[0] if self.sections else None
+
+    def section(self, bom_version: str) -> Optional[ReleaseSection]:
+        """Return the section of a BOM version."""
+        return self._by_version.get(bom_version)
+
+    def history(self, artifact_id: str) -> List[Tuple[str, str, str]]:
+        """
+        Return the version timeline of an artifact, oldest first, as (bom_version, version, status)
+        tuples: one per BOM that added it, changed its version or removed it.
+        """
+        timeline = []
+        previous_version = None
+        for section in reversed(self.sections):
+            entry = section.entries.get(artifact_id)
+            if entry is None:
+                continue
+            if entry.status == REMOVED_STATUS:
+                timeline.append((section.version, entry.version, entry.status))
+                previous_version = None
+            elif entry.version != previous_version:
+                timeline.append((section.version, entry.version, entry.status))
+                previous_version = entry.version
+        return timeline
+
+    def first_shipped(self, artifact_id: str, version: str) -> Optional[str]:
+        """Return the first BOM version shipping a given artifact version."""
+        for section in reversed(self.sections):
+            entry = section.entries.get(artifact_id)
+            if entry is not None and entry.version == version and entry.status != REMOVED_STATUS:
+                return section.version
+        return None
+
+    def diff(self, bom_a: str, bom_b: str) -> Dict[str, Dict]:
+        """
+        Compare the artifacts shipped by two BOM versions.
+        Returns {'added': {name: version}, 'removed': {name: version},
+        'changed': {name: (version_a, version_b)}}.
+        """
+        shipped_a = self._shipped(bom_a)
+        shipped_b = self._shipped(bom_b)
+        return {
+            'added': {name: shipped_b[name] for name in shipped_b if name not in shipped_a},
+            'removed': {name: shipped_a[name] for name in shipped_a if name not in shipped_b},
+            'changed': {
+                name: (shipped_a[name], shipped_b[name])
+                for name in shipped_a
+                if name in shipped_b and shipped_a[name] != shipped_b[name]
+            },
+        }
+
+    def _shipped(self, bom_version: str) -> Dict[str, str]:
+        """Return the artifacts shipped by a BOM version, removed ones excluded."""
+        section = self.section(bom_version)
+        if section is None:
+            raise KeyError(f"Unknown BOM version: {bom_version}")
+        return {name: entry.version for name, entry in section.entries.items() if entry.status != REMOVED_STATUS}
+
+
+def sidecar_path(filepath: str) -> str:
+    """Return the sidecar index path of a CHANGELOG file."""
+    directory, name = os.path.split(os.path.abspath(filepath))
+    return os.path.join(directory, f".{name}.index.json")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Query the release history of the BOM CHANGELOG.md.")
+    parser.add_argument("--changelog", default="CHANGELOG.md", help="CHANGELOG file (default: CHANGELOG.md)")
+    parser.add_argument("--no-sidecar", action="store_true", help="do not read or write the sidecar index")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    history = commands.add_parser("history", help="version history of an artifact")
+    history.add_argument("artifact")
+    first_shipped = commands.add_parser("first-shipped", help="first BOM shipping an artifact version")
+    first_shipped.add_argument("artifact")
+    first_shipped.add_argument("version")
+    diff = commands.add_parser("diff", help="differences between two BOM versions")
+    diff.add_argument("bom_a")
+    diff.add_argument("bom_b")
+    commands.add_parser("versions", help="list the BOM versions")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    try:
+        index = ChangelogIndex.load(args.changelog, use_sidecar=not args.no_sidecar)
+    except FileNotFoundError:
+        print(f"Error: {args.changelog} file not found")
+        sys.exit(1)
+
+    if args.command == "versions":
+        for section in index.sections:
+            print(section.version)
+
+    elif args.command == "history":
+        timeline = index.history(args.artifact)
+        if not timeline:
+            print(f"{args.artifact} is not referenced in {args.changelog}")
+            sys.exit(1)
+        for bom_version, version, status in timeline:
+            print(f"{bom_version}  {version:<10} {status}")
+
+    elif args.command == "first-shipped":
+        bom_version = index.first_shipped(args.artifact, args.version)
+        if bom_version is None:
+            print(f"{args.artifact} {args.version} was never shipped")
+            sys.exit(1)
+        print(bom_version)
+
+    elif args.command == "diff":
+        try:
+            changes = index.diff(args.bom_a, args.bom_b)
+        except KeyError as e:
+            print(f"Error: {e.args[0]}")
+            sys.exit(1)
+        for name, version in changes['added'].items():
+            print(f"🆕 {name} {version}")
+        for name, (version_a, version_b) in changes['changed'].items():
+            print(f"   {name} {version_a} → {version_b}")
+        for name, version in changes['removed'].items():
+            print(f"❌ {name} {version}")
+
+
+if __name__ == "__main__":
+    main()
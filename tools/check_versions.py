@@ -5,30 +5,927 @@ Script to check if BOM dependencies are up-to-date with their GitHub releases
 and if the Unreleased section of CHANGELOG.md is empty.
 """
 
+import argparse
+import hashlib
+import json
+import os
+import random
 import re
 import sys
 import io
-from typing import Dict, List, Tuple, Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Tuple, Optional
+from urllib.parse import parse_qs, urlsplit
+from xml.etree import ElementTree
 import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+import bom_model
+from atomic_file import write_atomically
+import maven_index
+import maven_version
+import release_notes
+import timing
+
+# Default number of dependencies verified in parallel
+DEFAULT_CONCURRENCY = 8
+
+GITHUB_API_URL = "https://api.github.com"
+# Media type returning the file itself from the contents API
+RAW_MEDIA_TYPE = "application/vnd.github.raw"
+# Size of the chunks read from a streamed CHANGELOG.md
+STREAM_CHUNK_SIZE = 8192
+
+UNRELEASED_PATTERN = re.compile(r'##\s*\[Unreleased\]')
+NEXT_SECTION_PATTERN = re.compile(r'##\s+\[')
+# Number of repositories fetched by a single GraphQL query
+GRAPHQL_BATCH_SIZE = 20
+# A batched query takes longer to answer than a REST call
+GRAPHQL_READ_TIMEOUT = 30
+# Release listing of the "releases behind" analysis, see list_releases()
+RELEASES_PER_PAGE = 100
+# Pages requested together once the first page did not reach the pinned version
+RELEASE_PAGE_WINDOW = 3
+DEFAULT_MAX_RELEASE_PAGES = 5
+
+# Persistent HTTP response cache defaults
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "keyple-java-bom")
+DEFAULT_CACHE_TTL = 600
+DEFAULT_CACHE_MAX_SIZE_MB = 50
+
+
+class ResponseCache:
+    """
+    On-disk cache of GitHub GET responses.
+
+    Entries are keyed by URL, Accept header and token, and store the ETag/Last-Modified
+    validators of the response. An entry younger than `ttl` seconds is served without any
+    request; an older one is revalidated with a conditional request (304 answers do not
+    count against the GitHub rate limit). 404 answers are cached too (negative caching).
+    The total body size is bounded by evicting the least recently used entries.
+    """
+
+    CACHE_FILE = "http-cache.json"
+    CACHED_STATUSES = (200, 404)
+
+    def __init__(self, cache_dir: str, ttl: int = DEFAULT_CACHE_TTL,
+                 max_size: int = DEFAULT_CACHE_MAX_SIZE_MB * 1024 * 1024):
+        self.path = os.path.join(cache_dir, self.CACHE_FILE)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def make_key(url: str, headers) -> str:
+        """Build the cache key of a request."""
+        auth = headers.get("Authorization", "")
+        token_hash = hashlib.sha256(auth.encode('utf-8')).hexdigest()[:16]
+        return f"{url} {headers.get('Accept', '')} {token_hash}"
+
+    def load(self) -> None:
+        """Load the cache file, starting empty if it is missing or corrupted."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self) -> None:
+        """Evict the least recently used entries above the size limit and write the cache atomically."""
+        with self._lock:
+            total = sum(len(entry['body']) for entry in self.entries.values())
+            for key in sorted(self.entries, key=lambda k: self.entries[k]['last_access']):
+                if total <= self.max_size:
+                    break
+                total -= len(self.entries.pop(key)['body'])
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            write_atomically(self.path, lambda f: json.dump(self.entries, f))
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Return the entry of a key and mark it as recently used."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry['last_access'] = time.time()
+            return entry
+
+    def record(self, outcome: str) -> None:
+        """Count a cache outcome: 'hits', 'revalidated' or 'misses'."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """Check if an entry can be served without revalidation."""
+        return time.time() - entry['stored_at'] < self.ttl
+
+    def touch(self, entry: Dict) -> None:
+        """Mark an entry as revalidated by a 304 answer."""
+        with self._lock:
+            entry['stored_at'] = time.time()
+
+    def store(self, key: str, response: requests.Response, partial_body: Optional[str] = None) -> None:
+        """
+        Store a response if its status is cacheable.
+        `partial_body` is the consumed prefix of a streamed response; such entries are only
+        served to streamed requests, whose readers stop at the same point.
+        """
+        if response.status_code not in self.CACHED_STATUSES:
+            return
+        now = time.time()
+        entry = {
+            'status': response.status_code,
+            'body': response.text if partial_body is None else partial_body,
+            'partial': partial_body is not None,
+            'encoding': response.encoding or 'utf-8',
+            'content_type': response.headers.get('Content-Type', ''),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'stored_at': now,
+            'last_access': now,
+        }
+        with self._lock:
+            self.entries[key] = entry
+
+    def summary(self) -> str:
+        """Return a one-line summary of the cache usage."""
+        return (f"{self.hits} served from cache, {self.revalidated} revalidated (304), "
+                f"{self.misses} downloaded")
+
+
+# Request headers of the answers that must come from GitHub, never from the cache
+NO_CACHE_HEADERS = {'Cache-Control': 'no-cache'}
+
+
+class CachingSession(requests.Session):
+    """
+    A requests session answering GET requests from a ResponseCache.
+    Streamed 200 responses are not stored automatically: their reader stores the consumed
+    part with store_streamed() once done. Requests sent with `Cache-Control: no-cache` bypass
+    the cache entirely.
+    """
+
+    def __init__(self, cache: ResponseCache):
+        super().__init__()
+        self.cache = cache
+
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() != 'GET' or NO_CACHE_HEADERS.items() <= (kwargs.get('headers') or {}).items():
+            return super().request(method, url, *args, **kwargs)
+
+        headers = dict(self.headers)
+        headers.update(kwargs.pop('headers', None) or {})
+        key = ResponseCache.make_key(url, headers)
+        stream = kwargs.get('stream', False)
+        entry = self.cache.lookup(key)
+        if entry is not None and entry.get('partial') and not stream:
+            entry = None
+
+        if entry is not None:
+            if self.cache.is_fresh(entry):
+                self.cache.record('hits')
+                return self._build_response(url, entry)
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            elif entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().request(method, url, *args, headers=headers, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.record('revalidated')
+            self.cache.touch(entry)
+            return self._build_response(url, entry)
+
+        self.cache.record('misses')
+        if stream and response.status_code == 200:
+            response.cache_key = key
+        else:
+            self.cache.store(key, response)
+        return response
+
+    def store_streamed(self, response: requests.Response, consumed: str) -> None:
+        """Store the consumed part of a streamed response."""
+        key = getattr(response, 'cache_key', None)
+        if key is not None:
+            self.cache.store(key, response, consumed)
+
+    @staticmethod
+    def _build_response(url: str, entry: Dict) -> requests.Response:
+        """Rebuild a response object from a cache entry."""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.url = url
+        response.encoding = entry['encoding']
+        response._content = entry['body'].encode(entry['encoding'])
+        response._content_consumed = True
+        response.headers['Content-Type'] = entry['content_type']
+        if entry['etag']:
+            response.headers['ETag'] = entry['etag']
+        return response
+
+
+# Request scheduling defaults
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_MAX_WAIT = 60
+# Below this remaining quota, requests are spread until the rate limit reset if more are expected
+PACING_THRESHOLD = 100
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+# Repository part of the API paths, replaced by "{repo}" in the HTTP span names
+REPO_PATH_PATTERN = re.compile(r'/repos/[^/]+/[^/]+')
+
+
+class GitHubApiError(RuntimeError):
+    """An error answer of the GitHub API, reported as the error of the dependencies it concerns."""
+
+
+class RateLimitExceeded(GitHubApiError):
+    """A GitHub request still rate limited once its retries are exhausted."""
+
+
+class RequestScheduler:
+    """
+    Pace GitHub requests according to the rate-limit headers and retry the failed ones.
+
+    The X-RateLimit-Remaining/Reset headers of each answer are tracked per rate-limit resource
+    (core, graphql...). When the remaining quota gets low and the requests still expected, as
+    declared with expect(), exceed it, requests are spread evenly until the reset; a run fitting
+    in the quota is never slowed down. When the quota is exhausted, requests wait for the reset,
+    at most `max_wait` seconds.
+    Idempotent requests failing with 429, a rate-limited 403, a 5xx or a connection error are
+    retried with jittered exponential backoff, honoring Retry-After.
+    """
+
+    def __init__(self, max_retries: int = DEFAULT_MAX_RETRIES, max_wait: float = DEFAULT_MAX_WAIT,
+                 sleep=time.sleep, clock=time.time):
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.sleep = sleep
+        self.clock = clock
+        # resource -> {'limit', 'remaining', 'reset'}
+        self.quotas: Dict[str, Dict[str, int]] = {}
+        self.retries = 0
+        self._next_slot: Dict[str, float] = {}
+        # resource -> number of requests still expected
+        self._pending: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def resource_of(url: str) -> str:
+        """Guess the rate-limit resource of a request before its answer is known."""
+        return "graphql" if url.rstrip('/').endswith('/graphql') else "core"
+
+    def expect(self, count: int, resource: str = "core") -> None:
+        """Declare the number of requests still to be sent to a resource."""
+        with self._lock:
+            self._pending[resource] = count
+
+    def acquire(self, url: str) -> None:
+        """Wait until a request to `url` may be sent."""
+        resource = self.resource_of(url)
+        with self._lock:
+            now = self.clock()
+            quota = self.quotas.get(resource)
+            pending = self._pending.get(resource, 0)
+            self._pending[resource] = max(pending - 1, 0)
+            delay = 0.0
+            if quota is not None and quota['reset'] > now:
+                until_reset = quota['reset'] - now
+                if quota['remaining'] <= 0:
+                    delay = until_reset if until_reset <= self.max_wait else 0.0
+                elif quota['remaining'] < PACING_THRESHOLD and pending > quota['remaining']:
+                    interval = until_reset / quota['remaining']
+                    slot = max(now, self._next_slot.get(resource, now))
+                    self._next_slot[resource] = slot + interval
+                    delay = min(slot - now, self.max_wait)
+                    # Reserve the quota of the request being sent
+                    quota['remaining'] -= 1
+        if delay > 0:
+            self.sleep(delay)
+
+    def update(self, url: str, response: requests.Response) -> None:
+        """Record the rate-limit headers of an answer."""
+        headers = response.headers
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+        resource = headers.get('X-RateLimit-Resource') or self.resource_of(url)
+        try:
+            quota = {
+                'limit': int(headers.get('X-RateLimit-Limit', 0)),
+                'remaining': int(headers['X-RateLimit-Remaining']),
+                'reset': int(headers.get('X-RateLimit-Reset', 0)),
+            }
+        except ValueError:
+            return
+        with self._lock:
+            self.quotas[resource] = quota
+
+    def retry_delay(self, attempt: int, response: Optional[requests.Response]) -> Optional[float]:
+        """
+        Return the delay before retrying a failed attempt (0-based), or None if it must not be retried.
+        `response` is None when the attempt raised a connection error.
+        """
+        if attempt >= self.max_retries:
+            return None
+        backoff = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
+        jittered = backoff / 2 + random.uniform(0, backoff / 2)
+        if response is None:
+            return jittered
+
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None and response.status_code in (403, 429, 503):
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = jittered
+        elif self.is_rate_limited(response):
+            delay = int(response.headers.get('X-RateLimit-Reset', 0)) - self.clock() + 1
+        elif response.status_code in RETRYABLE_STATUSES:
+            delay = jittered
+        else:
+            return None
+        if delay > self.max_wait:
+            return None
+        return max(delay, 0.0)
+
+    @staticmethod
+    def is_rate_limited(response: requests.Response) -> bool:
+        """Whether a 403/429 answer comes from the rate limit, rather than from missing permissions."""
+        return response.status_code in (403, 429) and (
+            response.headers.get('X-RateLimit-Remaining') == '0' or 'Retry-After' in response.headers
+        )
+
+    def record_retry(self) -> None:
+        """Count a retried request."""
+        with self._lock:
+            self.retries += 1
+
+    def summary(self) -> str:
+        """Return a one-line summary of the remaining quotas."""
+        with self._lock:
+            parts = []
+            for resource, quota in sorted(self.quotas.items()):
+                reset = time.strftime('%H:%M:%S', time.localtime(quota['reset']))
+                parts.append(f"{resource} {quota['remaining']}/{quota['limit']} remaining (reset at {reset})")
+            quotas = ", ".join(parts) if parts else "unknown"
+            return f"{quotas}; {self.retries} retried requests"
+
+
+# HTTP transport defaults
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 10
+# Number of cached connection pools, one per host
+POOL_HOSTS = 4
+
+
+class PooledTransport(HTTPAdapter):
+    """
+    Keep-alive HTTP transport with a connection pool of `pool_size` connections per host and
+    default connect/read timeouts.
+    The pool blocks when all its connections are busy, instead of opening extra connections
+    that are discarded after a single request.
+    """
+
+    def __init__(self, pool_size: int = 2 * DEFAULT_CONCURRENCY, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT):
+        super().__init__(pool_connections=POOL_HOSTS, pool_maxsize=pool_size, pool_block=True)
+        self.timeout = (connect_timeout, read_timeout)
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=self.timeout if timeout is None else timeout, **kwargs)
+
+
+class MemoryTransport(BaseAdapter):
+    """
+    In-memory transport answering from a handler, without any network access. The offline and
+    local Maven repository modes use one without routes, so that no request reaches GitHub.
+
+    `handler` receives each PreparedRequest and returns a (status, body, headers) tuple, where
+    body is a str, bytes or a JSON-serializable object. The requests sent are kept in `sent`.
+    """
+
+    def __init__(self, handler: Callable[[requests.PreparedRequest], Tuple[int, object, Dict[str, str]]]):
+        super().__init__()
+        self.handler = handler
+        self.sent: List[requests.PreparedRequest] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_routes(cls, routes: Dict[str, Tuple[int, object]]) -> "MemoryTransport":
+        """Build a transport answering by URL path; unknown paths answer 404."""
+        def handler(request):
+            status, body = routes.get(urlsplit(request.url).path, (404, {'message': 'Not Found'}))
+            return status, body, {}
+        return cls(handler)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        with self._lock:
+            self.sent.append(request)
+        status, body, headers = self.handler(request)
+        if isinstance(body, str):
+            content = body.encode('utf-8')
+            content_type = 'text/plain; charset=utf-8'
+        elif isinstance(body, bytes):
+            content = body
+            content_type = 'application/octet-stream'
+        else:
+            content = json.dumps(body).encode('utf-8')
+            content_type = 'application/json; charset=utf-8'
+
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict({'Content-Type': content_type, 'Content-Length': str(len(content))})
+        response.headers.update(headers)
+        response.raw = io.BytesIO(content)
+        response.url = request.url
+        response.request = request
+        response.encoding = 'utf-8'
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+class CountedBody:
+    """
+    Proxy of a response body counting, in the 'bytes' argument of a span, the bytes pulled from
+    the transport as they are read: compressed bytes as received, and only the part actually
+    read of a stream closed early. The span is complete when the body is read after it ends.
+    """
+
+    def __init__(self, raw, span: Dict):
+        self._raw = raw
+        self._span = span
+        span['bytes'] = 0
+        # requests streams the body through raw.stream() only when the body supports it
+        if hasattr(raw, 'stream'):
+            self.stream = self._stream
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def read(self, *args, **kwargs):
+        data = self._raw.read(*args, **kwargs)
+        self._span['bytes'] = self._raw.tell()
+        return data
+
+    def _stream(self, *args, **kwargs):
+        for chunk in self._raw.stream(*args, **kwargs):
+            self._span['bytes'] = self._raw.tell()
+            yield chunk
+
+
+class SchedulingAdapter(BaseAdapter):
+    """
+    HTTP adapter sending each request through a RequestScheduler, then through its transport.
+    Each call is recorded as an "http" span of the tracer, retries and waits included, with the
+    number of body bytes read.
+    """
+
+    def __init__(self, scheduler: RequestScheduler, transport: Optional[BaseAdapter] = None,
+                 tracer: Optional[timing.Tracer] = None):
+        super().__init__()
+        self.scheduler = scheduler
+        self.transport = transport or PooledTransport()
+        self.tracer = tracer or timing.Tracer(enabled=False)
+
+    def close(self):
+        self.transport.close()
+
+    def send(self, request, **kwargs):
+        path = urlsplit(request.url).path
+        name = f"{request.method} {REPO_PATH_PATTERN.sub('/repos/{repo}', path)}"
+        with self.tracer.span(name, "http", target=path) as span:
+            response = self._send_scheduled(request, span, **kwargs)
+            span['status'] = response.status_code
+            if self.tracer.enabled:
+                response.raw = CountedBody(response.raw, span)
+            return response
+
+    def _send_scheduled(self, request, span: Dict, **kwargs):
+        retryable = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            self.scheduler.acquire(request.url)
+            try:
+                response = self.transport.send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                delay = self.scheduler.retry_delay(attempt, None) if retryable else None
+                if delay is None:
+                    raise
+            else:
+                self.scheduler.update(request.url, response)
+                delay = self.scheduler.retry_delay(attempt, response) if retryable else None
+                if delay is None:
+                    return response
+                response.close()
+            self.scheduler.record_retry()
+            self.scheduler.sleep(delay)
+            attempt += 1
+            span['retries'] = attempt
+
+
+# Incremental check defaults
+DEFAULT_STATE_FILE = ".check_versions_state.json"
+DEFAULT_STATE_MAX_AGE_HOURS = 24
+
+
+class CheckState:
+    """
+    Persisted results of the previous checks, keyed by "groupId:artifactId:version", so that
+    BOMs pinning different versions of an artifact keep one entry each.
+
+    Each entry records the BOM version that was verified, the latest upstream tag, a hash of
+    the upstream Unreleased section and the full check_dependency() result. In incremental
+    mode, an entry is reused when it is not older than `max_age` seconds; older entries are
+    dropped when the state is saved.
+    """
+
+    def __init__(self, path: str, max_age: float = DEFAULT_STATE_MAX_AGE_HOURS * 3600):
+        self.path = path
+        self.max_age = max_age
+        self.entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """Load the state file, starting empty if it is missing or corrupted."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self) -> None:
+        """Drop the expired entries and write the state file atomically."""
+        with self._lock:
+            now = time.time()
+            self.entries = {
+                key: entry for key, entry in self.entries.items() if now - entry['checked_at'] <= self.max_age
+            }
+            write_atomically(self.path, lambda f: json.dump(self.entries, f, indent=2, sort_keys=True))
+
+    def lookup(self, group_id: str, artifact_id: str, version: str) -> Optional[Dict]:
+        """Return the entry of a dependency if it is still valid for `version`."""
+        with self._lock:
+            entry = self.entries.get(f"{group_id}:{artifact_id}:{version}")
+        if entry is None or entry['verified_version'] != version:
+            return None
+        if time.time() - entry['checked_at'] > self.max_age:
+            return None
+        return entry
+
+    def record(self, result: Dict) -> None:
+        """Record the result of a completed check; failed checks are not recorded."""
+        if result['error']:
+            return
+        content = result['unreleased_content'] or ''
+        entry = {
+            'verified_version': result['current_version'],
+            'latest_version': result['latest_version'],
+            'changelog_hash': hashlib.sha256(content.encode('utf-8')).hexdigest(),
+            'checked_at': time.time(),
+            'result': dict(result),
+        }
+        with self._lock:
+            self.entries[f"{result['group_id']}:{result['artifact_id']}:{result['current_version']}"] = entry
+
+
+# Offline snapshot format, see Snapshot
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class Snapshot:
+    """
+    Upstream answers of a verification run, recorded with --record and replayed with --offline.
+
+    Each repository entry has the same fields as a GraphQL prefetched entry: 'latest_version'
+    (None when the repository has no release), 'changelog_status' ('found', 'not_found' or
+    'unreadable') and 'unreleased_section' (None when there is no Unreleased section).
+    Only definitive answers are recorded: a rate-limited or failed request leaves the
+    repository out of the snapshot.
+    """
+
+    FIELDS = ('latest_version', 'changelog_status', 'unreleased_section')
+
+    def __init__(self, repos: Optional[Dict[str, Dict]] = None, recorded_at: Optional[float] = None):
+        self.repos: Dict[str, Dict] = repos or {}
+        self.recorded_at = recorded_at
+        self._lock = threading.Lock()
+
+    def record(self, repo: str, **fields) -> None:
+        """Record some fields of a repository entry."""
+        with self._lock:
+            self.repos.setdefault(repo, {}).update(fields)
+
+    def complete_entries(self) -> Dict[str, Dict]:
+        """The entries having all their fields recorded."""
+        with self._lock:
+            return {
+                repo: dict(entry) for repo, entry in self.repos.items()
+                if all(name in entry for name in self.FIELDS)
+            }
+
+    @classmethod
+    def load(cls, path: str) -> "Snapshot":
+        """Load a snapshot file; raises ValueError if it is not a snapshot."""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get('format') != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"{path} is not a snapshot of format {SNAPSHOT_FORMAT_VERSION}")
+        return cls(data['repos'], data.get('recorded_at'))
+
+    def save(self, path: str) -> int:
+        """Write the complete entries atomically and return their number."""
+        entries = self.complete_entries()
+        data = {'format': SNAPSHOT_FORMAT_VERSION, 'recorded_at': time.time(), 'repos': entries}
+        write_atomically(path, lambda f: json.dump(data, f, ensure_ascii=False, separators=(',', ':'), sort_keys=True))
+        return len(entries)
+
+
+class NdjsonWriter:
+    """Stream one JSON record per dependency result, as soon as each check completes."""
+
+    def __init__(self, path: str):
+        self.file = open(path, 'w', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def write(self, result: Dict) -> None:
+        """Write and flush the record of a result."""
+        line = json.dumps(result, ensure_ascii=False)
+        with self._lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def append_bom_records(path: str, boms: List[Tuple[str, List[Dict]]]) -> None:
+    """Append the records of each BOM of a multi-BOM run to an NDJSON file, with their 'bom' label."""
+    with open(path, 'a', encoding='utf-8') as f:
+        for label, results in boms:
+            for result in results:
+                f.write(json.dumps(dict(result, bom=label), ensure_ascii=False) + '\n')
+
+
+def classify_results(results: List[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Sort results into 'up_to_date', 'outdated', 'with_unreleased' and 'errors'.
+    A dependency both outdated and with unreleased changes appears in both lists.
+    """
+    groups: Dict[str, List[Dict]] = {'up_to_date': [], 'outdated': [], 'with_unreleased': [], 'errors': []}
+    for result in results:
+        if result['error']:
+            groups['errors'].append(result)
+        else:
+            if result['is_up_to_date']:
+                groups['up_to_date'].append(result)
+            else:
+                groups['outdated'].append(result)
+            if not result['unreleased_empty']:
+                groups['with_unreleased'].append(result)
+    return groups
+
+
+def release_steps(current_version: str, versions: Iterable[str]) -> Dict[str, int]:
+    """
+    Count the major, minor and patch steps of the upgrade path going from `current_version`
+    through each of `versions` in order.
+    """
+    steps = {'major': 0, 'minor': 0, 'patch': 0}
+    previous = maven_version.parse_version(current_version).release_components(3)
+    for version in maven_version.sort_versions(versions):
+        components = maven_version.parse_version(version).release_components(3)
+        if components[0] != previous[0]:
+            steps['major'] += 1
+        elif components[1] != previous[1]:
+            steps['minor'] += 1
+        else:
+            steps['patch'] += 1
+        previous = components
+    return steps
+
+
+def describe_behind(behind: Dict) -> str:
+    """Describe a 'releases_behind' entry, e.g. "3 releases (1 major, 1 minor, 1 patch)"."""
+    count = behind['count']
+    text = f"{'' if behind['complete'] else 'at least '}{count} release{'s' if count != 1 else ''}"
+    steps = [f"{behind[step]} {step}" for step in ('major', 'minor', 'patch') if behind[step]]
+    return f"{text} ({', '.join(steps)})" if steps else text
+
+
+def summarize_results(results: List[Dict]) -> Dict[str, int]:
+    """Count the results of each group of classify_results()."""
+    summary = {'total': len(results)}
+    summary.update((name, len(group)) for name, group in classify_results(results).items())
+    return summary
+
+
+def write_json_report(path: str, results: List[Dict],
+                      boms: Optional[List[Tuple[str, List[Dict]]]] = None) -> None:
+    """
+    Write all the results, in BOM order, with a summary, as a JSON document.
+    In multi-BOM mode, `boms` holds the (label, results) of each BOM, written with their own summary.
+    """
+    report = {
+        'summary': summarize_results(results),
+        'results': results,
+    }
+    if boms is not None:
+        report['boms'] = [
+            {'bom': label, 'summary': summarize_results(bom_results), 'results': bom_results}
+            for label, bom_results in boms
+        ]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def save_release_notes(path: str, results: List[Dict]) -> int:
+    """
+    Merge the release notes of the results into a notes file, keyed by library (KMP variants
+    share the notes of their base library). Returns the number of releases written.
+    """
+    try:
+        notes = release_notes.ReleaseNotes.load(path)
+    except FileNotFoundError:
+        notes = release_notes.ReleaseNotes()
+    written = 0
+    for result in results:
+        if not result.get('release_notes') or bom_model.split_kmp_variant(result['artifact_id'])[1]:
+            continue
+        for release in result['release_notes']:
+            notes.add(result['group_id'], result['artifact_id'], release['version'], release['notes'])
+            written += 1
+    notes.save(path)
+    return written
+
+
+def union_dependencies(boms: List[Tuple[str, List[Tuple[str, str, str]]]]) -> List[Tuple[str, str, str]]:
+    """The distinct dependencies of several BOMs, in order of first appearance."""
+    return list(dict.fromkeys(dependency for _, dependencies in boms for dependency in dependencies))
+
+
+def print_bom_matrix(boms: List[Tuple[str, List[Dict]]]) -> None:
+    """
+    Print the version of each dependency in each BOM, marked ✓ (up to date), ⚠ (outdated) or
+    ✗ (error), next to its latest release.
+    """
+    rows: Dict[Tuple[str, str], Dict] = {}
+    for index, (_, results) in enumerate(boms):
+        for result in results:
+            row = rows.setdefault((result['group_id'], result['artifact_id']), {'latest': None, 'cells': {}})
+            row['latest'] = row['latest'] or result['latest_version']
+            if result['error']:
+                mark = "✗"
+            else:
+                mark = "✓" if result['is_up_to_date'] else "⚠"
+            row['cells'][index] = f"{result['current_version']} {mark}"
+
+    name_width = max([len("Dependency")] + [len(artifact_id) for _, artifact_id in rows])
+    latest_width = max([len("Latest")] + [len(row['latest'] or "-") for row in rows.values()])
+    widths = [
+        max([len(label)] + [len(row['cells'].get(index, "")) for row in rows.values()])
+        for index, (label, _) in enumerate(boms)
+    ]
+    print("="*80)
+    print("CROSS-BOM MATRIX")
+    print("="*80)
+    header = f"  {'Dependency':<{name_width}}  {'Latest':<{latest_width}}"
+    header += "".join(f" | {label:<{width}}" for (label, _), width in zip(boms, widths))
+    print(header.rstrip())
+    print("-" * max(80, len(header)))
+    for (_, artifact_id), row in rows.items():
+        line = f"  {artifact_id:<{name_width}}  {row['latest'] or '-':<{latest_width}}"
+        line += "".join(f" | {row['cells'].get(index, ''):<{width}}" for index, width in enumerate(widths))
+        print(line.rstrip())
+    print("="*80 + "\n")
+
+
+def write_junit_report(path: str, results: List[Dict],
+                       boms: Optional[List[Tuple[str, List[Dict]]]] = None) -> None:
+    """
+    Write the results as a JUnit XML report: one test case per dependency, failing when it is
+    outdated or has unreleased changes, in error when it could not be checked.
+    In multi-BOM mode, `boms` holds the (label, results) of each BOM, written as one test suite each.
+    """
+    if boms is None:
+        root = junit_suite('bom-version-check', results)
+    else:
+        root = ElementTree.Element('testsuites', {'name': 'bom-version-check'})
+        root.extend(junit_suite(f"bom-version-check: {label}", bom_results) for label, bom_results in boms)
+    ElementTree.ElementTree(root).write(path, encoding='utf-8', xml_declaration=True)
+
+
+def junit_suite(name: str, results: List[Dict]) -> ElementTree.Element:
+    """Build the JUnit test suite of the results of one BOM."""
+    groups = classify_results(results)
+    suite = ElementTree.Element('testsuite', {
+        'name': name,
+        'tests': str(len(results)),
+        'failures': str(sum(
+            1 for r in results
+            if not r['error'] and (not r['is_up_to_date'] or not r['unreleased_empty'])
+        )),
+        'errors': str(len(groups['errors'])),
+    })
+    for result in results:
+        case = ElementTree.SubElement(suite, 'testcase', {
+            'classname': result['group_id'],
+            'name': f"{result['artifact_id']}:{result['current_version']}",
+        })
+        if result['error']:
+            ElementTree.SubElement(case, 'error', {'message': result['error']})
+        else:
+            messages = []
+            if not result['is_up_to_date']:
+                messages.append(f"Outdated: {result['current_version']} → {result['latest_version']}")
+            if not result['unreleased_empty']:
+                messages.append(result['unreleased_message'])
+            if messages:
+                failure = ElementTree.SubElement(case, 'failure', {'message': '; '.join(messages)})
+                failure.text = result['unreleased_content'] or ''
+    return suite
+
 
 class DependencyChecker:
     """Check BOM dependencies against GitHub releases."""
 
-    def __init__(self, github_token: str):
+    def __init__(self, github_token: str, cache: Optional[ResponseCache] = None,
+                 scheduler: Optional[RequestScheduler] = None, api_url: str = GITHUB_API_URL,
+                 state: Optional[CheckState] = None, incremental: bool = False,
+                 tracer: Optional[timing.Tracer] = None, transport: Optional[BaseAdapter] = None,
+                 snapshot: Optional[Snapshot] = None, version_index: Optional[maven_index.MavenIndex] = None):
         self.github_token = github_token
+        self.api_url = api_url.rstrip('/')
         self.headers = {
             "Authorization": f"token {github_token}",
-            "Accept": "application/vnd.github.v3+json"
+            "Accept": "application/vnd.github.v3+json",
+            "Accept-Encoding": "gzip, deflate"
         }
-        self.session = requests.Session()
+        self.cache = cache
+        self.scheduler = scheduler or RequestScheduler()
+        self.session = CachingSession(cache) if cache is not None else requests.Session()
         self.session.headers.update(self.headers)
+        self.tracer = tracer or timing.Tracer(enabled=False)
+        adapter = SchedulingAdapter(self.scheduler, transport, self.tracer)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.token_valid = None
+        self._local = threading.local()
+        # Upstream answers fetched ahead of time by the GraphQL backend, or loaded from an
+        # offline snapshot, keyed by repository
+        self.prefetched: Dict[str, Dict] = {}
+        # Snapshot recording the upstream answers, see --record
+        self.snapshot = snapshot
+        # Whether no request may reach the network: answers come from a snapshot, see
+        # load_snapshot(), or from the local Maven repository index
+        self.offline = False
+        # Local Maven repository index answering the latest versions instead of GitHub
+        self.version_index = version_index
+        # Pool used to issue the requests of one repository together, see fetch_upstream()
+        self._request_executor: Optional[ThreadPoolExecutor] = None
+        # Results of the previous runs, reused in incremental mode
+        self.state = state
+        self.incremental = incremental and state is not None
+        # Pending or completed upstream lookups by repository, see claim_upstream()
+        self._upstream: Dict[str, Tuple[Future, Future]] = {}
+        self._upstream_lock = threading.Lock()
+        # Releases newer than a pinned version by (repository, version), see newer_releases()
+        self._release_listings: Dict[Tuple[str, str], Tuple[List[Dict], bool]] = {}
+        # BOM versions of the libraries by (groupId, artifactId), see check_variant_version()
+        self.bom_versions: Dict[Tuple[str, str], str] = {}
+        # Called with each result as soon as its check completes, from the worker threads
+        self.result_listeners: List[Callable[[Dict], None]] = []
+
+    def log(self, message: str = "") -> None:
+        """
+        Print a per-dependency progress line.
+        Inside a worker thread the line is buffered instead, so that the output
+        of concurrent checks can be flushed as one block per dependency.
+        """
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            print(message)
+        else:
+            buffer.append(message)
 
     def verify_token(self) -> bool:
-        """Verify if the GitHub token is valid."""
+        """Verify if the GitHub token is valid, never from the cache: a revoked token would pass."""
         print("  → Connecting to GitHub API...")
         try:
-            response = self.session.get("https://api.github.com/user", timeout=10)
+            response = self.session.get(f"{self.api_url}/user", headers=NO_CACHE_HEADERS)
             self.token_valid = (response.status_code == 200)
             if self.token_valid:
                 print("  ✓ Token is valid")
@@ -60,21 +957,33 @@ class DependencyChecker:
         Returns list of tuples: (groupId, artifactId, version)
         """
         print(f"  → Analyzing file {filepath}...")
-        dependencies = []
-        api_pattern = re.compile(r'api\("([^:]+):([^:]+):([^"]+)"\)')
-
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        for match in api_pattern.finditer(content):
-            group_id = match.group(1)
-            artifact_id = match.group(2)
-            version = match.group(3)
-            dependencies.append((group_id, artifact_id, version))
-
+        dependencies = bom_model.load_bom(filepath).as_tuples()
         print(f"  ✓ {len(dependencies)} dependencies found")
         return dependencies
 
+    def parse_boms(self, sources: List[str]) -> List[Tuple[str, List[Tuple[str, str, str]]]]:
+        """
+        Parse several BOMs, each given as a build.gradle.kts file or, when no such file exists,
+        as a git ref whose build.gradle.kts is read from the local repository.
+        Returns (source, dependencies) pairs, in the order of `sources`.
+        """
+        print(f"  → Analyzing {len(sources)} BOM{'s' if len(sources) != 1 else ''}...")
+        refs = [source for source in sources if not os.path.isfile(source)]
+        # All the refs are read with a single git process
+        contents = dict(zip(refs, bom_model.read_git_contents(refs))) if refs else {}
+        boms = []
+        for source in sources:
+            if source in contents:
+                if contents[source] is None:
+                    raise ValueError(f"{source} is neither a file nor a git ref with a build.gradle.kts")
+                model = bom_model.parse_bom_content(contents[source])
+            else:
+                model = bom_model.load_bom(source)
+            dependencies = model.as_tuples()
+            print(f"  ✓ {source}: {len(dependencies)} dependencies")
+            boms.append((source, dependencies))
+        return boms
+
     def is_kmp_library(self, artifact_id: str) -> bool:
         """
         Check if the artifact is a KMP (Kotlin Multiplatform) library variant.
@@ -82,6 +991,12 @@ class DependencyChecker:
         """
         return '-kmp-lib-' in artifact_id
 
+    def upstream_artifact(self, artifact_id: str) -> str:
+        """Return the artifact whose repository releases an artifact: the base library of a KMP variant."""
+        if self.is_kmp_library(artifact_id):
+            return bom_model.split_kmp_variant(artifact_id)[0]
+        return artifact_id
+
     def map_to_github_repo(self, group_id: str, artifact_id: str) -> str:
         """
         Map Maven coordinates to GitHub repository.
@@ -97,103 +1012,318 @@ class DependencyChecker:
 
         return f"{org}/{artifact_id}"
 
-    def get_latest_release(self, repo: str) -> Optional[str]:
-        """Get the latest release version from GitHub."""
-        url = f"https://api.github.com/repos/{repo}/releases/latest"
-        print(f"    → Retrieving latest release...")
+    def request_latest_release(self, repo: str) -> requests.Response:
+        """Request the latest release of a repository."""
+        return self.session.get(f"{self.api_url}/repos/{repo}/releases/latest")
+
+    def request_changelog(self, repo: str) -> requests.Response:
+        """
+        Request the raw CHANGELOG.md of a repository in a single round-trip.
+        The body is streamed, see read_unreleased_section().
+        """
+        response = self.session.get(
+            f"{self.api_url}/repos/{repo}/contents/CHANGELOG.md",
+            headers={"Accept": RAW_MEDIA_TYPE},
+            stream=True
+        )
+        response.encoding = 'utf-8'
+        return response
+
+    def fetch_upstream(self, repo: str) -> Tuple["Future[requests.Response]", "Future[requests.Response]"]:
+        """
+        Issue the latest release and CHANGELOG.md requests of a repository together.
+        Returns the pending (release, changelog) responses.
+        """
+        return (
+            self._submit(self.request_latest_release, repo),
+            self._submit(self.request_changelog, repo),
+        )
+
+    def _submit(self, fn, *args) -> Future:
+        """Run fn on the request pool, or inline when no pool is active."""
+        if self._request_executor is not None:
+            return self._request_executor.submit(fn, *args)
+        future: Future = Future()
         try:
-            response = self.session.get(url, timeout=10)
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def get_latest_release(self, repo: str, pending: Optional[Future] = None) -> Optional[str]:
+        """
+        Get the latest release version from GitHub.
+        `pending` is the response already requested by fetch_upstream(), if any.
+        Raises RateLimitExceeded when the request is still rate limited after its retries, and
+        GitHubApiError on any other error answer.
+        """
+        self.log(f"    → Retrieving latest release...")
+        if repo in self.prefetched:
+            version = self.prefetched[repo]['latest_version']
+            if version is None:
+                self.log(f"    ✗ No release found")
+            else:
+                self.log(f"    ✓ Version found: {version}")
+            return version
+
+        try:
+            response = pending.result() if pending else self.request_latest_release(repo)
             if response.status_code == 200:
                 data = response.json()
                 tag_name = data.get('tag_name', '')
                 # Remove 'v' prefix if present
                 version = tag_name.lstrip('v')
-                print(f"    ✓ Version found: {version}")
+                self.log(f"    ✓ Version found: {version}")
+                self._record(repo, latest_version=version)
                 return version
             elif response.status_code == 404:
-                print(f"    ✗ No release found")
+                self.log(f"    ✗ No release found")
+                self._record(repo, latest_version=None)
                 return None
             else:
-                print(f"    ⚠ API returned status {response.status_code}")
-                return None
+                raise self.api_error(response)
+        except GitHubApiError:
+            raise
         except Exception as e:
-            print(f"    ✗ Error: {e}")
+            self.log(f"    ✗ Error: {e}")
             return None
 
-    def check_unreleased_section(self, repo: str) -> Tuple[bool, str, Optional[str]]:
+    def check_unreleased_section(self, repo: str, pending: Optional[Future] = None) -> Tuple[bool, str, Optional[str]]:
         """
         Check if the Unreleased section in CHANGELOG.md is empty.
-        Returns (is_empty, message, full_content)
+        `pending` is the response already requested by fetch_upstream(), if any.
+        Returns (is_empty, message, full_content); raises GitHubApiError on an error answer
+        other than 404, such as an exhausted rate limit.
         """
-        url = f"https://api.github.com/repos/{repo}/contents/CHANGELOG.md"
-        print(f"    → Checking Unreleased section...")
-        try:
-            response = self.session.get(url, timeout=10)
-            if response.status_code != 200:
-                print(f"    ⚠ CHANGELOG.md not found")
+        self.log(f"    → Checking Unreleased section...")
+        if repo in self.prefetched:
+            entry = self.prefetched[repo]
+            if entry['changelog_status'] == 'not_found':
+                self.log(f"    ⚠ CHANGELOG.md not found")
                 return (True, "CHANGELOG.md not found", None)
-
-            # Get the download URL
-            data = response.json()
-            download_url = data.get('download_url')
-            if not download_url:
-                print(f"    ⚠ Could not access content")
+            if entry['changelog_status'] == 'unreadable':
+                self.log(f"    ⚠ Could not access content")
                 return (True, "Cannot access CHANGELOG.md content", None)
+            return self.analyze_unreleased_section(entry['unreleased_section'])
+
+        try:
+            response = pending.result() if pending else self.request_changelog(repo)
+            try:
+                if response.status_code == 404:
+                    self.log(f"    ⚠ CHANGELOG.md not found")
+                    self._record(repo, changelog_status='not_found', unreleased_section=None)
+                    return (True, "CHANGELOG.md not found", None)
+                if response.status_code != 200:
+                    raise self.api_error(response)
+                section = self.read_unreleased_section(response)
+                self._record(repo, changelog_status='found', unreleased_section=section)
+            finally:
+                response.close()
 
-            # Download the actual file content
-            changelog_response = self.session.get(download_url, timeout=10)
-            if changelog_response.status_code != 200:
-                print(f"    ⚠ Could not download CHANGELOG")
-                return (True, "Cannot download CHANGELOG.md", None)
+            return self.analyze_unreleased_section(section)
 
-            content = changelog_response.text
+        except GitHubApiError:
+            raise
+        except Exception as e:
+            self.log(f"    ✗ Error: {e}")
+            return (True, f"Error checking CHANGELOG: {e}", None)
 
-            # Find the Unreleased section
-            unreleased_pattern = re.compile(r'^##\s*\[Unreleased\]', re.MULTILINE)
-            next_section_pattern = re.compile(r'^##\s+\[', re.MULTILINE)
+    def read_unreleased_section(self, response: requests.Response) -> Optional[str]:
+        """
+        Read a streamed CHANGELOG.md response up to the end of its Unreleased section only.
+        The rest of the body is never downloaded.
+        """
+        consumed: List[str] = []
 
-            unreleased_match = unreleased_pattern.search(content)
-            if not unreleased_match:
-                print(f"    ⚠ Unreleased section not found")
-                return (True, "No Unreleased section found", None)
+        def lines():
+            pending = ''
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE, decode_unicode=True):
+                pending += chunk
+                *complete, pending = pending.split('\n')
+                for line in complete:
+                    consumed.append(line + '\n')
+                    yield line + '\n'
+            if pending:
+                consumed.append(pending)
+                yield pending
 
-            # Extract content after Unreleased header
-            start_pos = unreleased_match.end()
-            remaining_content = content[start_pos:]
+        section = self.extract_unreleased_section(lines())
+        if isinstance(self.session, CachingSession):
+            self.session.store_streamed(response, ''.join(consumed))
+        return section
 
-            # Find the next section (next ## line)
-            next_section_match = next_section_pattern.search(remaining_content)
-            if next_section_match:
-                section_content = remaining_content[:next_section_match.start()]
+    @staticmethod
+    def extract_unreleased_section(lines: Iterable[str]) -> Optional[str]:
+        """
+        Return the text between the Unreleased heading and the next "## [" heading,
+        or None if there is no Unreleased section. Stops reading at the next heading.
+        """
+        section = None
+        for line in lines:
+            if section is None:
+                unreleased_match = UNRELEASED_PATTERN.match(line)
+                if unreleased_match:
+                    section = [line[unreleased_match.end():]]
+            elif NEXT_SECTION_PATTERN.match(line):
+                break
             else:
-                section_content = remaining_content
-
-            # Check if section is empty (only whitespace and separators)
-            # Remove whitespace and common separators
-            cleaned = section_content.strip()
-            cleaned = re.sub(r'^[-=\s]+$', '', cleaned, flags=re.MULTILINE)
-            cleaned = cleaned.strip()
-
-            if cleaned:
-                # Section has content
-                print(f"    ⚠ Contains unreleased changes ({len(cleaned)} characters)")
-                print(f"\n    CONTENT OF UNRELEASED SECTION:")
-                print("    " + "-" * 76)
-                # Display the full content with indentation
-                for line in section_content.strip().split('\n'):
-                    print(f"    {line}")
-                print("    " + "-" * 76 + "\n")
-                return (False, f"Has unreleased changes ({len(cleaned)} chars)", section_content.strip())
+                section.append(line)
+        return ''.join(section) if section is not None else None
+
+    def analyze_unreleased_section(self, section_content: Optional[str]) -> Tuple[bool, str, Optional[str]]:
+        """
+        Check if an Unreleased section extracted by extract_unreleased_section() is empty.
+        Returns (is_empty, message, full_content)
+        """
+        if section_content is None:
+            self.log(f"    ⚠ Unreleased section not found")
+            return (True, "No Unreleased section found", None)
+
+        # Check if section is empty (only whitespace and separators)
+        # Remove whitespace and common separators
+        cleaned = section_content.strip()
+        cleaned = re.sub(r'^[-=\s]+$', '', cleaned, flags=re.MULTILINE)
+        cleaned = cleaned.strip()
+
+        if cleaned:
+            # Section has content
+            self.log(f"    ⚠ Contains unreleased changes ({len(cleaned)} characters)")
+            self.log(f"\n    CONTENT OF UNRELEASED SECTION:")
+            self.log("    " + "-" * 76)
+            # Display the full content with indentation
+            for line in section_content.strip().split('\n'):
+                self.log(f"    {line}")
+            self.log("    " + "-" * 76 + "\n")
+            return (False, f"Has unreleased changes ({len(cleaned)} chars)", section_content.strip())
+        else:
+            self.log(f"    ✓ Section is empty")
+            return (True, "Empty", None)
+
+    def prefetch_graphql(self, dependencies: List[Tuple[str, str, str]]) -> None:
+        """
+        Fetch the latest release tag and the CHANGELOG.md text of every mapped repository
+        with batched GraphQL queries.
+        Repositories of a failed batch are not prefetched and fall back to the REST API.
+        """
+        repos = []
+        for group_id, artifact_id, version in dependencies:
+            if self.reusable_state(group_id, artifact_id, version):
+                continue
+            try:
+                repo = self.map_to_github_repo(group_id, self.upstream_artifact(artifact_id))
+            except ValueError:
+                continue
+            if repo not in repos:
+                repos.append(repo)
+
+        print(f"  → Fetching {len(repos)} repositories with GraphQL...")
+        for i in range(0, len(repos), GRAPHQL_BATCH_SIZE):
+            batch = repos[i:i + GRAPHQL_BATCH_SIZE]
+            try:
+                self.prefetched.update(self._query_graphql_batch(batch))
+            except Exception as e:
+                print(f"  ⚠ GraphQL query failed, falling back to REST for {len(batch)} repositories: {e}")
+        print(f"  ✓ {len(self.prefetched)} repositories prefetched")
+
+    def _query_graphql_batch(self, repos: List[str]) -> Dict[str, Dict]:
+        """Run one GraphQL query for a batch of repositories and return the prefetched entries."""
+        fields = []
+        for index, repo in enumerate(repos):
+            owner, name = repo.split('/', 1)
+            fields.append(
+                f'r{index}: repository(owner: "{owner}", name: "{name}") {{ '
+                f'latestRelease {{ tagName }} '
+                f'changelog: object(expression: "HEAD:CHANGELOG.md") {{ ... on Blob {{ text }} }} '
+                f'}}'
+            )
+        query = "query { " + " ".join(fields) + " }"
+
+        response = self.session.post(
+            f"{self.api_url}/graphql",
+            json={"query": query},
+            timeout=(DEFAULT_CONNECT_TIMEOUT, GRAPHQL_READ_TIMEOUT)
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"API returned status {response.status_code}")
+        payload = response.json()
+        data = payload.get('data')
+        if data is None:
+            raise RuntimeError(payload.get('errors', 'no data returned'))
+
+        # Only "repository not found" errors are expected, they are equivalent to REST 404s
+        for error in payload.get('errors') or []:
+            if error.get('type') != 'NOT_FOUND':
+                raise RuntimeError(error.get('message', error))
+
+        entries = {}
+        for index, repo in enumerate(repos):
+            repository = data.get(f"r{index}")
+            release = repository.get('latestRelease') if repository else None
+            changelog = repository.get('changelog') if repository else None
+            text = changelog.get('text') if changelog else None
+            if changelog is None:
+                changelog_status, section = 'not_found', None
+            elif text is None:
+                changelog_status, section = 'unreadable', None
             else:
-                print(f"    ✓ Section is empty")
-                return (True, "Empty", None)
+                changelog_status = 'found'
+                section = self.extract_unreleased_section(text.splitlines(keepends=True))
+            entries[repo] = {
+                'latest_version': release['tagName'].lstrip('v') if release else None,
+                'changelog_status': changelog_status,
+                'unreleased_section': section,
+            }
+            self._record(repo, **entries[repo])
+        return entries
 
-        except Exception as e:
-            print(f"    ✗ Error: {e}")
-            return (True, f"Error checking CHANGELOG: {e}", None)
+    def _record(self, repo: str, **fields) -> None:
+        """Record upstream answers in the snapshot, when recording."""
+        if self.snapshot is not None:
+            self.snapshot.record(repo, **fields)
+
+    def load_snapshot(self, snapshot: Snapshot) -> None:
+        """Answer from a snapshot only: repositories missing from it are reported as errors."""
+        self.prefetched.update(snapshot.complete_entries())
+        self.offline = True
+
+    def reusable_state(self, group_id: str, artifact_id: str, version: str) -> Optional[Dict]:
+        """Return the state entry reused for a dependency in incremental mode, if any."""
+        if not self.incremental:
+            return None
+        return self.state.lookup(group_id, artifact_id, version)
 
     def check_dependency(self, group_id: str, artifact_id: str, current_version: str) -> Dict:
-        """Check a single dependency."""
+        """Check a single dependency and notify the result listeners."""
+        with self.tracer.span("check dependency", "dependency", target=f"{group_id}:{artifact_id}:{current_version}"):
+            result = self._check_or_reuse(group_id, artifact_id, current_version)
+        for listener in self.result_listeners:
+            listener(result)
+        return result
+
+    def _check_or_reuse(self, group_id: str, artifact_id: str, current_version: str) -> Dict:
+        """Check a single dependency, reusing the previous result in incremental mode."""
+        previous = self.reusable_state(group_id, artifact_id, current_version)
+        if previous is not None:
+            checked_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(previous['checked_at']))
+            self.log(f"    ↺ Unchanged since last check ({checked_at})")
+            result = dict(previous['result'])
+            if result['is_up_to_date']:
+                self.log(f"    ✓ Up to date")
+            else:
+                self.log(f"    ⚠ Outdated: {current_version} → {result['latest_version']}")
+            if not result['unreleased_empty']:
+                self.log(f"    ⚠ {result['unreleased_message']}")
+            # The base library of a KMP variant may have changed since the variant was recorded
+            self.check_variant_version(result)
+            return result
+
+        result = self.verify_dependency(group_id, artifact_id, current_version)
+        if self.state is not None:
+            self.state.record(result)
+        return result
+
+    def verify_dependency(self, group_id: str, artifact_id: str, current_version: str) -> Dict:
+        """Verify a single dependency against GitHub."""
         result = {
             'group_id': group_id,
             'artifact_id': artifact_id,
@@ -203,89 +1333,489 @@ class DependencyChecker:
             'unreleased_empty': None,
             'unreleased_message': None,
             'unreleased_content': None,
-            'error': None,
-            'skipped': False
+            'error': None
         }
 
         try:
-            # Check if this is a KMP library variant
-            if self.is_kmp_library(artifact_id):
-                print(f"    ⊘ KMP library skipped (no individual GitHub release)")
-                result['skipped'] = True
-                result['error'] = "KMP library variant (skipped)"
-                return result
+            if self.version_index is not None:
+                self.verify_with_index(result)
+            else:
+                self.verify_upstream(result)
+            self.check_variant_version(result)
+
+        except Exception as e:
+            self.log(f"    ✗ Error: {e}")
+            result['error'] = str(e)
 
-            repo = self.map_to_github_repo(group_id, artifact_id)
+        return result
 
-            # Check latest release
-            latest_version = self.get_latest_release(repo)
-            result['latest_version'] = latest_version
+    def verify_upstream(self, result: Dict) -> None:
+        """
+        Verify a dependency against the GitHub repository of its library.
+        KMP variants are verified against the repository of their base library.
+        """
+        artifact_id = result['artifact_id']
+        current_version = result['current_version']
+        base_artifact_id = self.upstream_artifact(artifact_id)
+        if base_artifact_id != artifact_id:
+            self.log(f"    ↳ KMP variant of {base_artifact_id}")
+        repo = self.map_to_github_repo(result['group_id'], base_artifact_id)
+        if self.offline and repo not in self.prefetched:
+            raise ValueError(f"{repo} is not in the snapshot")
+
+        owner, release, unreleased = self.claim_upstream(repo)
+        pending_release, pending_changelog = None, None
+        try:
+            if owner:
+                if repo not in self.prefetched:
+                    pending_release, pending_changelog = self.fetch_upstream(repo)
+                # Check latest release
+                with self.tracer.span("latest release", "step", repo=repo):
+                    try:
+                        release.set_result(self.get_latest_release(repo, pending_release))
+                    except GitHubApiError as e:
+                        # The dependencies sharing the lookup fail with the same error
+                        release.set_exception(e)
+            else:
+                self.log(f"    → Reusing the lookup of {repo}...")
+            latest_version = release.result()
+            if not owner:
+                self.log(f"    ✓ Version found: {latest_version}" if latest_version else f"    ✗ No release found")
 
+            result['latest_version'] = latest_version
             if latest_version:
-                result['is_up_to_date'] = (current_version == latest_version)
+                # The BOM may pin a pre-release newer than the latest release
+                result['is_up_to_date'] = maven_version.compare_versions(current_version, latest_version) >= 0
                 if result['is_up_to_date']:
-                    print(f"    ✓ Up to date")
+                    self.log(f"    ✓ Up to date")
                 else:
-                    print(f"    ⚠ Outdated: {current_version} → {latest_version}")
+                    self.log(f"    ⚠ Outdated: {current_version} → {latest_version}")
             else:
                 result['error'] = "No release found on GitHub"
 
-            # Check unreleased section
-            is_empty, message, content = self.check_unreleased_section(repo)
-            result['unreleased_empty'] = is_empty
-            result['unreleased_message'] = message
-            result['unreleased_content'] = content
+            if owner:
+                # Check unreleased section
+                with self.tracer.span("unreleased section", "step", repo=repo):
+                    try:
+                        unreleased.set_result(self.check_unreleased_section(repo, pending_changelog))
+                    except GitHubApiError as e:
+                        unreleased.set_exception(e)
+            is_empty, message, content = unreleased.result()
+            if not owner and not is_empty:
+                self.log(f"    ⚠ {message}")
+        finally:
+            if owner:
+                if pending_changelog is not None and not unreleased.done():
+                    # Release the connection held by the unread streamed CHANGELOG
+                    pending_changelog.add_done_callback(self._close_response)
+                # Never leave the dependencies sharing the lookup waiting
+                for future in (release, unreleased):
+                    if not future.done():
+                        future.set_exception(RuntimeError(f"Lookup of {repo} failed"))
 
-        except Exception as e:
-            print(f"    ✗ Error: {e}")
-            result['error'] = str(e)
+        result['unreleased_empty'] = is_empty
+        result['unreleased_message'] = message
+        result['unreleased_content'] = content
 
-        return result
+    @staticmethod
+    def api_error(response: requests.Response) -> GitHubApiError:
+        """The error of an unexpected answer, telling an exhausted rate limit apart."""
+        if RequestScheduler.is_rate_limited(response):
+            return RateLimitExceeded(f"GitHub API rate limit exceeded (status {response.status_code})")
+        return GitHubApiError(f"GitHub API returned status {response.status_code}")
+
+    @staticmethod
+    def _close_response(future: Future) -> None:
+        if future.exception() is None:
+            future.result().close()
+
+    def claim_upstream(self, repo: str) -> Tuple[bool, Future, Future]:
+        """
+        Return (owner, latest release, Unreleased section check) futures of a repository.
+        A repository is looked up once: the first caller owns the lookup and completes the
+        futures, the dependencies sharing the repository, such as the KMP variants of a
+        library, wait for them.
+        """
+        with self._upstream_lock:
+            futures = self._upstream.get(repo)
+            owner = futures is None
+            if owner:
+                futures = (Future(), Future())
+                self._upstream[repo] = futures
+        return (owner,) + futures
+
+    def check_variant_version(self, result: Dict) -> None:
+        """Report a KMP variant whose version differs from the one of its base library in the BOM."""
+        error = self.variant_version_error(result, self.bom_versions)
+        if error:
+            self.log(f"    ✗ {error}")
+            result['error'] = error
+
+    def variant_version_error(self, result: Dict, bom_versions: Dict[Tuple[str, str], str]) -> Optional[str]:
+        """Return the error of a KMP variant whose version differs from the one of its base library, if any."""
+        base_artifact_id = self.upstream_artifact(result['artifact_id'])
+        base_version = bom_versions.get((result['group_id'], base_artifact_id))
+        if base_artifact_id == result['artifact_id'] or base_version is None:
+            return None
+        if base_version != result['current_version']:
+            return f"KMP variant version differs from {base_artifact_id} ({base_version})"
+        return None
+
+    def library_versions(self, dependencies: List[Tuple[str, str, str]]) -> Dict[Tuple[str, str], str]:
+        """The BOM versions of the libraries, KMP variants excepted, by (groupId, artifactId)."""
+        return {
+            (group_id, artifact_id): version
+            for group_id, artifact_id, version in dependencies
+            if not self.is_kmp_library(artifact_id)
+        }
+
+    def bom_results(self, dependencies: List[Tuple[str, str, str]],
+                    results: Dict[Tuple[str, str, str], Dict]) -> List[Dict]:
+        """
+        Return the results of one BOM, copied from the `results` of the union of several BOMs,
+        the KMP variants being checked against the libraries of this BOM.
+        """
+        bom_versions = self.library_versions(dependencies)
+        bom_results = []
+        for dependency in dependencies:
+            result = dict(results[dependency])
+            error = self.variant_version_error(result, bom_versions)
+            if error and not result['error']:
+                result['error'] = error
+            bom_results.append(result)
+        return bom_results
+
+    def verify_with_index(self, result: Dict) -> None:
+        """
+        Verify a dependency, KMP variants included, against the local Maven repository index.
+        The Unreleased section is not checked.
+        """
+        self.log(f"    → Looking up the local Maven repository...")
+        current_version = result['current_version']
+        latest_version = self.version_index.latest(result['group_id'], result['artifact_id'])
+        result['latest_version'] = latest_version
+        if latest_version is None:
+            self.log(f"    ✗ Not found in the local Maven repository")
+            result['error'] = "Not found in the local Maven repository"
+        else:
+            self.log(f"    ✓ Version found: {latest_version}")
+            # The BOM may pin a version not downloaded yet
+            result['is_up_to_date'] = maven_version.compare_versions(current_version, latest_version) >= 0
+            if result['is_up_to_date']:
+                self.log(f"    ✓ Up to date")
+            else:
+                self.log(f"    ⚠ Outdated: {current_version} → {latest_version}")
+        result['unreleased_empty'] = True
+        result['unreleased_message'] = "Not checked (local Maven repository)"
+
+    def _check_dependency_buffered(self, group_id: str, artifact_id: str, version: str) -> Tuple[Dict, List[str]]:
+        """Check a single dependency and return its result with the buffered progress lines."""
+        self._local.buffer = []
+        try:
+            result = self.check_dependency(group_id, artifact_id, version)
+            return result, self._local.buffer
+        finally:
+            self._local.buffer = None
+
+    def check_dependencies(self, dependencies: List[Tuple[str, str, str]], concurrency: int = 1,
+                           bom_versions: Optional[Dict[Tuple[str, str], str]] = None) -> List[Dict]:
+        """
+        Check all dependencies, using up to `concurrency` worker threads.
+        Results and progress lines are always emitted in the order of `dependencies`.
+        The KMP variants are checked against `bom_versions`, by default the library versions
+        of `dependencies`.
+        """
+        total = len(dependencies)
+        self.bom_versions = self.library_versions(dependencies) if bom_versions is None else bom_versions
+        if not self.offline:
+            self.scheduler.expect(self.expected_requests(dependencies))
+        # Each dependency issues its two requests together
+        self._request_executor = ThreadPoolExecutor(max_workers=2 * concurrency)
+        try:
+            if concurrency <= 1:
+                results = []
+                for i, (group_id, artifact_id, version) in enumerate(dependencies, 1):
+                    print(f"\n[{i}/{total}] {group_id}:{artifact_id}:{version}")
+                    results.append(self.check_dependency(group_id, artifact_id, version))
+                return results
+            return self._check_dependencies_concurrently(dependencies, concurrency)
+        finally:
+            self._request_executor.shutdown()
+            self._request_executor = None
+
+    def expected_requests(self, dependencies: List[Tuple[str, str, str]]) -> int:
+        """Number of requests of a check: a release and a CHANGELOG request per repository not prefetched."""
+        repos = set()
+        for group_id, artifact_id, _ in dependencies:
+            try:
+                repos.add(self.map_to_github_repo(group_id, self.upstream_artifact(artifact_id)))
+            except ValueError:
+                continue
+        return 2 * len(repos.difference(self.prefetched))
+
+    def _check_dependencies_concurrently(self, dependencies: List[Tuple[str, str, str]], concurrency: int) -> List[Dict]:
+        """Check dependencies on a pool of `concurrency` workers, flushing their output in order."""
+        total = len(dependencies)
+        results = []
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(self._check_dependency_buffered, group_id, artifact_id, version)
+                for group_id, artifact_id, version in dependencies
+            ]
+            # Flush each block as soon as it and all the previous ones are done
+            for i, ((group_id, artifact_id, version), future) in enumerate(zip(dependencies, futures), 1):
+                result, lines = future.result()
+                print(f"\n[{i}/{total}] {group_id}:{artifact_id}:{version}")
+                for line in lines:
+                    print(line)
+                results.append(result)
+        return results
+
+    def request_releases_page(self, repo: str, page: int) -> requests.Response:
+        """Request one page of the releases of a repository, newest first."""
+        return self.session.get(f"{self.api_url}/repos/{repo}/releases?per_page={RELEASES_PER_PAGE}&page={page}")
+
+    def list_releases(self, repo: str, current_version: str,
+                      max_pages: int = DEFAULT_MAX_RELEASE_PAGES) -> Tuple[List[Dict], bool, int]:
+        """
+        List the published releases of a repository newer than `current_version`.
+        The first page is requested alone: most repositories have a single page. The next pages
+        are requested RELEASE_PAGE_WINDOW at a time, up to the last page given by the Link header
+        and to `max_pages` pages, until a window reaches a release not newer than the pinned one.
+        Returns (newer releases as {'version', 'body'}, whether all of them were listed, pages
+        requested): the listing is complete once it reached the pinned version or the last page.
+        """
+        current = maven_version.parse_version(current_version)
+        newer: List[Dict] = []
+        reached = False
+        # Unknown until a response gives it; cached responses have no Link header
+        last_page: Optional[int] = None
+        page = 1
+        window = 1
+        while not reached and page <= min(max_pages, last_page or max_pages):
+            pages = range(page, min(page + window, max_pages + 1, (last_page or max_pages) + 1))
+            futures = [self._submit(self.request_releases_page, repo, number) for number in pages]
+            for future in futures:
+                response = future.result()
+                if response.status_code != 200:
+                    raise RuntimeError(f"API returned status {response.status_code} listing the releases")
+                if 'last' in response.links:
+                    query = parse_qs(urlsplit(response.links['last']['url']).query)
+                    last_page = int(query['page'][0])
+                releases = response.json()
+                if len(releases) < RELEASES_PER_PAGE:
+                    # Last page
+                    reached = True
+                for release in releases:
+                    if release.get('draft') or release.get('prerelease'):
+                        continue
+                    version = release.get('tag_name', '').lstrip('v')
+                    # Listed by creation date: a later backport may follow, the page is read to its end
+                    if maven_version.parse_version(version) > current:
+                        newer.append({'version': version, 'body': release.get('body') or ''})
+                    else:
+                        reached = True
+            page = pages[-1] + 1
+            window = RELEASE_PAGE_WINDOW
+            if last_page is not None and page > last_page:
+                reached = True
+        return newer, reached, page - 1
 
-    def generate_report(self, results: List[Dict]) -> None:
-        """Generate and print the verification report."""
+    def newer_releases(self, repo: str, current_version: str,
+                       max_pages: int = DEFAULT_MAX_RELEASE_PAGES) -> Tuple[List[Dict], bool, int]:
+        """
+        Return list_releases() of a repository, memoized by pinned version: the releases behind
+        analysis and the release notes share the listing, a memoized one costs no request.
+        """
+        key = (repo, current_version)
+        with self._upstream_lock:
+            listing = self._release_listings.get(key)
+        if listing is not None:
+            return listing[0], listing[1], 0
+        with self.tracer.span("list releases", "step", target=repo) as span:
+            releases, complete, requested = self.list_releases(repo, current_version, max_pages)
+            span['pages'] = requested
+        with self._upstream_lock:
+            self._release_listings[key] = (releases, complete)
+        return releases, complete, requested
+
+    def _list_concurrently(self, function: Callable, keys: List[Tuple],
+                           concurrency: int) -> List[Tuple[Tuple, object, Optional[Exception]]]:
+        """
+        Run function(*key) for each key on `concurrency` workers, the release pages being
+        requested on the request pool. Returns (key, value, error) tuples in the order of `keys`.
+        """
+        outcomes = []
+        # Each listing requests up to RELEASE_PAGE_WINDOW pages together
+        self._request_executor = ThreadPoolExecutor(max_workers=concurrency * RELEASE_PAGE_WINDOW)
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [executor.submit(function, *key) for key in keys]
+                for key, future in zip(keys, futures):
+                    try:
+                        outcomes.append((key, future.result(), None))
+                    except Exception as e:
+                        outcomes.append((key, None, e))
+        finally:
+            self._request_executor.shutdown()
+            self._request_executor = None
+        return outcomes
+
+    def releases_behind(self, group_id: str, artifact_id: str, current_version: str,
+                        max_pages: int = DEFAULT_MAX_RELEASE_PAGES) -> Tuple[Dict, int]:
+        """
+        Return the 'releases_behind' entry of a dependency and the number of requests it took.
+        With a local Maven repository index, the versions come from the index, without any request.
+        """
+        if self.version_index is not None:
+            versions = [
+                version for version in self.version_index.versions(group_id, artifact_id)
+                if not maven_version.is_snapshot(version)
+                and maven_version.compare_versions(version, current_version) > 0
+            ]
+            complete, requested = True, 0
+        else:
+            repo = self.map_to_github_repo(group_id, self.upstream_artifact(artifact_id))
+            releases, complete, requested = self.newer_releases(repo, current_version, max_pages)
+            versions = [release['version'] for release in releases]
+        behind = {
+            'count': len(versions),
+            'complete': complete,
+            'highest_version': maven_version.max_version(versions) if versions else current_version,
+        }
+        behind.update(release_steps(current_version, versions))
+        return behind, requested
+
+    def analyze_releases_behind(self, results: List[Dict], max_pages: int = DEFAULT_MAX_RELEASE_PAGES,
+                                concurrency: int = 1) -> int:
+        """
+        Add a 'releases_behind' entry to the checked results: the number of releases newer than
+        the BOM version, the major/minor/patch steps they make and the highest of them, which
+        may be newer than the release flagged as latest. A dependency is then outdated as soon
+        as a newer release exists.
+        Repositories are listed once per pinned version, so KMP variants share the listing of
+        their base library; at most `max_pages` requests are made per repository.
+        Returns the number of requests made.
+        """
+        pending: Dict[Tuple, List[Dict]] = {}
+        for result in results:
+            if result['error']:
+                continue
+            if self.version_index is not None:
+                key = (result['group_id'], result['artifact_id'], result['current_version'])
+            else:
+                key = (result['group_id'], self.upstream_artifact(result['artifact_id']), result['current_version'])
+            pending.setdefault(key, []).append(result)
+
+        requested = 0
+        keys = [key + (max_pages,) for key in pending]
+        for key, outcome, error in self._list_concurrently(self.releases_behind, keys, concurrency):
+            if error is not None:
+                print(f"  ⚠ {key[0]}:{key[1]}: {error}")
+                continue
+            behind, count = outcome
+            requested += count
+            for result in pending[key[:3]]:
+                result['releases_behind'] = behind
+                if behind['count'] and result['is_up_to_date']:
+                    print(f"  ⚠ {result['group_id']}:{result['artifact_id']}: "
+                          f"{behind['highest_version']} is newer than the latest release "
+                          f"{result['latest_version']}")
+                    result['is_up_to_date'] = False
+        return requested
+
+    def release_notes_of(self, group_id: str, artifact_id: str, current_version: str,
+                         max_pages: int = DEFAULT_MAX_RELEASE_PAGES) -> Tuple[List[Dict], int]:
+        """
+        Return the {'version', 'notes'} of the releases of a library newer than `current_version`,
+        oldest first, and the number of requests it took.
+        """
+        repo = self.map_to_github_repo(group_id, artifact_id)
+        releases, _, requested = self.newer_releases(repo, current_version, max_pages)
+        by_version = {release['version']: release['body'] for release in releases}
+        notes = [
+            {'version': version, 'notes': by_version[version]}
+            for version in maven_version.sort_versions(by_version)
+        ]
+        return notes, requested
+
+    def collect_release_notes(self, results: List[Dict], max_pages: int = DEFAULT_MAX_RELEASE_PAGES,
+                              concurrency: int = 1) -> int:
+        """
+        Add a 'release_notes' entry to the outdated results: the notes of the GitHub releases
+        newer than the BOM version, oldest first. The listings are shared with the releases
+        behind analysis and the KMP variants share the notes of their base library; the pages
+        go through the HTTP cache like the other requests.
+        Returns the number of requests made.
+        """
+        pending: Dict[Tuple, List[Dict]] = {}
+        for result in results:
+            if result['error'] or result['is_up_to_date']:
+                continue
+            key = (result['group_id'], self.upstream_artifact(result['artifact_id']), result['current_version'])
+            pending.setdefault(key, []).append(result)
+
+        requested = 0
+        keys = [key + (max_pages,) for key in pending]
+        for key, outcome, error in self._list_concurrently(self.release_notes_of, keys, concurrency):
+            if error is not None:
+                print(f"  ⚠ {key[0]}:{key[1]}: {error}")
+                continue
+            notes, count = outcome
+            requested += count
+            for result in pending[key[:3]]:
+                result['release_notes'] = notes
+        return requested
+
+    def generate_report(self, results: List[Dict], title: str = "BOM VERSION VERIFICATION REPORT") -> bool:
+        """
+        Generate and print the verification report.
+        Returns True if there are outdated dependencies, unreleased changes or errors.
+        """
         print("\n" + "="*80)
-        print("BOM VERSION VERIFICATION REPORT")
+        print(title)
         print("="*80 + "\n")
 
-        outdated = []
-        with_unreleased = []
-        errors = []
-        up_to_date = []
-        skipped = []
+        groups = classify_results(results)
 
-        for result in results:
-            dep_name = f"{result['group_id']}:{result['artifact_id']}"
+        def name_of(result: Dict) -> str:
+            return f"{result['group_id']}:{result['artifact_id']}"
 
-            if result['skipped']:
-                skipped.append(dep_name)
-            elif result['error']:
-                errors.append((dep_name, result['error']))
-            else:
-                if result['is_up_to_date']:
-                    up_to_date.append(dep_name)
-                else:
-                    outdated.append((
-                        dep_name,
-                        result['current_version'],
-                        result['latest_version']
-                    ))
-
-                if not result['unreleased_empty']:
-                    with_unreleased.append((
-                        dep_name,
-                        result['unreleased_message'],
-                        result['unreleased_content']
-                    ))
+        outdated = [
+            (name_of(r), r['current_version'], r['latest_version'], r.get('releases_behind'), r.get('release_notes'),
+             self.upstream_artifact(r['artifact_id']))
+            for r in groups['outdated']
+        ]
+        with_unreleased = [
+            (name_of(r), r['unreleased_message'], r['unreleased_content']) for r in groups['with_unreleased']
+        ]
+        errors = [(name_of(r), r['error']) for r in groups['errors']]
+        up_to_date = [name_of(r) for r in groups['up_to_date']]
 
         # Print outdated dependencies
         if outdated:
             print("[!] OUTDATED DEPENDENCIES:")
             print("-" * 80)
-            for dep_name, current, latest in outdated:
+            for dep_name, current, latest, behind, notes, base_artifact_id in outdated:
                 print(f"  {dep_name}")
                 print(f"    Current: {current}")
                 print(f"    Latest:  {latest}")
+                if behind:
+                    if behind['highest_version'] != latest:
+                        print(f"    Highest: {behind['highest_version']}")
+                    print(f"    Behind:  {describe_behind(behind)}")
+                if notes and not dep_name.endswith(f":{base_artifact_id}"):
+                    # KMP variant
+                    print(f"    Release notes: see {base_artifact_id}")
+                elif notes:
+                    print(f"\n    RELEASE NOTES:")
+                    print("    " + "-" * 76)
+                    for release in notes:
+                        print(f"    {release['version']}")
+                        for line in release['notes'].strip().split('\n'):
+                            if line.strip():
+                                print(f"      {line.rstrip()}")
+                    print("    " + "-" * 76)
                 print()
         else:
             print("[OK] All dependencies are up to date")
@@ -310,14 +1840,6 @@ class DependencyChecker:
             print("[OK] All dependencies have empty Unreleased sections")
             print()
 
-        # Print skipped dependencies
-        if skipped:
-            print("[INFO] SKIPPED DEPENDENCIES (KMP):")
-            print("-" * 80)
-            for dep_name in skipped:
-                print(f"  {dep_name}")
-            print()
-
         # Print errors
         if errors:
             print("[ERROR] ERRORS:")
@@ -335,23 +1857,208 @@ class DependencyChecker:
         print(f"  Up to date:                   {len(up_to_date)}")
         print(f"  Outdated:                     {len(outdated)}")
         print(f"  With unreleased changes:      {len(with_unreleased)}")
-        print(f"  Skipped (KMP):                {len(skipped)}")
         print(f"  Errors:                       {len(errors)}")
         print("="*80 + "\n")
 
-        # Exit with error code if there are issues
-        if outdated or with_unreleased or errors:
-            sys.exit(1)
-        else:
-            sys.exit(0)
+        return bool(outdated or with_unreleased or errors)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Check BOM dependencies against their GitHub releases and CHANGELOG.md files."
+    )
+    parser.add_argument(
+        "-j", "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"number of dependencies verified in parallel (default: {DEFAULT_CONCURRENCY}, 1 = sequential)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["rest", "graphql"],
+        default="rest",
+        help="GitHub API used for release and CHANGELOG lookups (default: rest); "
+             "graphql batches all lookups into a few queries and falls back to rest on failure"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"directory of the persistent HTTP response cache (default: {DEFAULT_CACHE_DIR})"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=DEFAULT_CACHE_TTL,
+        help=f"seconds during which cached responses are used without revalidation (default: {DEFAULT_CACHE_TTL})"
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=int,
+        default=DEFAULT_CACHE_MAX_SIZE_MB,
+        help=f"maximum size of the cache in MB (default: {DEFAULT_CACHE_MAX_SIZE_MB})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="disable the persistent HTTP response cache"
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        help=f"retries of a failed or rate-limited request (default: {DEFAULT_MAX_RETRIES})"
+    )
+    parser.add_argument(
+        "--max-wait",
+        type=float,
+        default=DEFAULT_MAX_WAIT,
+        help=f"maximum seconds to wait for a rate limit reset or a Retry-After (default: {DEFAULT_MAX_WAIT})"
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=DEFAULT_CONNECT_TIMEOUT,
+        help=f"seconds to wait for a connection to the API (default: {DEFAULT_CONNECT_TIMEOUT})"
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        default=DEFAULT_READ_TIMEOUT,
+        help=f"seconds to wait for data from the API (default: {DEFAULT_READ_TIMEOUT})"
+    )
+    parser.add_argument(
+        "--api-url",
+        default=GITHUB_API_URL,
+        help=f"base URL of the GitHub API (default: {GITHUB_API_URL})"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="re-query only the dependencies whose version changed or whose last check is stale"
+    )
+    parser.add_argument(
+        "--state-file",
+        default=DEFAULT_STATE_FILE,
+        help=f"file recording the results of the previous checks (default: {DEFAULT_STATE_FILE})"
+    )
+    parser.add_argument(
+        "--state-max-age",
+        type=float,
+        default=DEFAULT_STATE_MAX_AGE_HOURS,
+        help=f"hours after which a recorded result is re-checked (default: {DEFAULT_STATE_MAX_AGE_HOURS})"
+    )
+    parser.add_argument(
+        "--ndjson",
+        metavar="FILE",
+        help="stream one JSON record per dependency to FILE as soon as its check completes; with several "
+             "--bom, the records of each BOM, labeled by a 'bom' field, are appended once the checks are done"
+    )
+    parser.add_argument(
+        "--json",
+        metavar="FILE",
+        help="write all the results and a summary to FILE as JSON"
+    )
+    parser.add_argument(
+        "--junit",
+        metavar="FILE",
+        help="write the results to FILE as a JUnit XML report, with one test suite per BOM with several --bom"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="write the timings of the phases and HTTP calls to FILE as a Chrome trace"
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="print a summary table of the phase and HTTP call timings"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="run under cProfile and dump the statistics to FILE"
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--record",
+        metavar="FILE",
+        help="record the upstream answers (latest tags and Unreleased sections) to a snapshot FILE"
+    )
+    source.add_argument(
+        "--offline",
+        metavar="FILE",
+        help="verify against a snapshot FILE recorded with --record, without network access nor token"
+    )
+    source.add_argument(
+        "--maven-repo",
+        nargs="?",
+        const=maven_index.DEFAULT_REPOSITORY,
+        metavar="PATH",
+        help="take the latest versions from a local Maven repository instead of GitHub, without network "
+             f"access nor token; the Unreleased sections are not checked (default: {maven_index.DEFAULT_REPOSITORY})"
+    )
+    parser.add_argument(
+        "--maven-index",
+        default=maven_index.DEFAULT_INDEX_FILE,
+        metavar="FILE",
+        help=f"index of the local Maven repository versions (default: {maven_index.DEFAULT_INDEX_FILE})"
+    )
+    parser.add_argument(
+        "--bom",
+        action="append",
+        metavar="SOURCE",
+        help="BOM to verify, as a build.gradle.kts file or a git ref (default: build.gradle.kts); repeat it "
+             "to verify several BOMs at once, each upstream repository being queried once, with a report "
+             "per BOM and a cross-BOM matrix"
+    )
+    parser.add_argument(
+        "--behind",
+        action="store_true",
+        help="list the releases of each repository to report how many releases, and which major/minor/patch "
+             "steps, separate the BOM from upstream"
+    )
+    parser.add_argument(
+        "--release-notes",
+        nargs="?",
+        const=release_notes.DEFAULT_NOTES_FILE,
+        metavar="FILE",
+        help="fetch the notes of the releases newer than each outdated dependency, include them in the report "
+             "and merge them into FILE, read by update_changelog.py --notes "
+             f"(default: {release_notes.DEFAULT_NOTES_FILE})"
+    )
+    parser.add_argument(
+        "--max-release-pages",
+        type=int,
+        default=DEFAULT_MAX_RELEASE_PAGES,
+        help=f"maximum number of release pages ({RELEASES_PER_PAGE} releases each) requested per repository "
+             f"by --behind and --release-notes (default: {DEFAULT_MAX_RELEASE_PAGES})"
+    )
+    args = parser.parse_args()
+    if args.max_retries < 0:
+        parser.error("--max-retries must not be negative")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.cache_ttl < 0:
+        parser.error("--cache-ttl must not be negative")
+    if args.max_release_pages < 1:
+        parser.error("--max-release-pages must be at least 1")
+    return args
 
 
 def main():
     """Main entry point."""
-    print("="*80)
-    print("BOM VERSION VERIFICATION")
-    print("="*80 + "\n")
+    args = parse_args()
+    tracer = timing.Tracer(enabled=bool(args.trace or args.timings))
+    try:
+        with timing.profiled(args.profile):
+            verify(args, tracer)
+    finally:
+        timing.report(tracer, args.trace, args.timings)
 
+
+def connect_checker(args: argparse.Namespace, tracer: timing.Tracer) -> "DependencyChecker":
+    """Load the GitHub token and return a checker connected to the API, or exit."""
     # Parse user.properties to get GitHub token
     try:
         print("Phase 1: Configuration Loading")
@@ -367,10 +2074,24 @@ def main():
         print()
         print("Phase 2: GitHub Token Validation")
         print("-" * 80)
-        checker = DependencyChecker(github_token)
+        cache = None
+        if not args.no_cache:
+            cache = ResponseCache(args.cache_dir, args.cache_ttl, args.cache_max_size * 1024 * 1024)
+        scheduler = RequestScheduler(args.max_retries, args.max_wait)
+        state = CheckState(args.state_file, args.state_max_age * 3600)
+        # Each dependency issues its two requests together
+        transport = PooledTransport(2 * args.concurrency, args.connect_timeout, args.read_timeout)
+        # A recorded snapshot must cover every dependency, none is reused from the state
+        snapshot = Snapshot() if args.record else None
+        incremental = args.incremental and snapshot is None
+        checker = DependencyChecker(
+            github_token, cache, scheduler, args.api_url, state, incremental, tracer, transport, snapshot
+        )
 
         # Verify token
-        if not checker.verify_token():
+        with tracer.span("verify token"):
+            token_valid = checker.verify_token()
+        if not token_valid:
             print("\n  ✗ Error: Invalid GitHub Token")
             print("  The token must be a valid GitHub Personal Access Token.")
             sys.exit(1)
@@ -382,14 +2103,91 @@ def main():
         print(f"  ✗ Error while reading user.properties: {e}")
         sys.exit(1)
 
-    # Parse build.gradle.kts
+    return checker
+
+
+def load_offline_checker(args: argparse.Namespace, tracer: timing.Tracer) -> "DependencyChecker":
+    """Return a checker answering from the snapshot file only, or exit."""
+    print("Phase 1: Snapshot Loading")
+    print("-" * 80)
+    try:
+        snapshot = Snapshot.load(args.offline)
+    except FileNotFoundError:
+        print(f"  ✗ Error: snapshot file {args.offline} not found")
+        sys.exit(1)
+    except (ValueError, KeyError) as e:
+        print(f"  ✗ Error while reading the snapshot: {e}")
+        sys.exit(1)
+    recorded_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(snapshot.recorded_at or 0))
+    print(f"  ✓ {len(snapshot.repos)} repositories recorded on {recorded_at}")
+    print()
+    print("Phase 2: GitHub Token Validation")
+    print("-" * 80)
+    print("  ⊘ Skipped (offline mode)")
+
+    # No request can reach the network: unknown repositories are reported as errors
+    checker = DependencyChecker("", tracer=tracer, transport=MemoryTransport.from_routes({}))
+    checker.load_snapshot(snapshot)
+    return checker
+
+
+def load_maven_checker(args: argparse.Namespace, tracer: timing.Tracer) -> "DependencyChecker":
+    """Return a checker answering from the local Maven repository index, or exit."""
+    print("Phase 1: Maven Repository Indexing")
+    print("-" * 80)
+    if not os.path.isdir(args.maven_repo):
+        print(f"  ✗ Error: Maven repository {args.maven_repo} not found")
+        sys.exit(1)
+    index = maven_index.MavenIndex(args.maven_repo, args.maven_index)
+    with tracer.span("index maven repository"):
+        index.refresh()
+    print(f"  ✓ {len(index.artifacts)} artifacts indexed in {args.maven_repo} "
+          f"({index.scanned} scanned, {index.reused} unchanged)")
+    try:
+        index.save()
+    except OSError as e:
+        print(f"  ⚠ Could not save Maven repository index: {e}")
+    print()
+    print("Phase 2: GitHub Token Validation")
+    print("-" * 80)
+    print("  ⊘ Skipped (local Maven repository)")
+
+    checker = DependencyChecker(
+        "", tracer=tracer, transport=MemoryTransport.from_routes({}), version_index=index
+    )
+    checker.offline = True
+    return checker
+
+
+def verify(args: argparse.Namespace, tracer: timing.Tracer) -> None:
+    """Run the verification phases, then exit with the report status."""
+    print("="*80)
+    print("BOM VERSION VERIFICATION")
+    print("="*80 + "\n")
+
+    if args.offline:
+        checker = load_offline_checker(args, tracer)
+    elif args.maven_repo:
+        checker = load_maven_checker(args, tracer)
+    else:
+        checker = connect_checker(args, tracer)
+
+    # Parse build.gradle.kts, or the BOMs given as files or git refs
+    sources = args.bom or ["build.gradle.kts"]
+    boms = None
     try:
         print()
         print("Phase 3: Dependency Analysis")
         print("-" * 80)
-        dependencies = checker.parse_build_gradle("build.gradle.kts")
+        with tracer.span("parse build.gradle.kts", count=len(sources)):
+            if not args.bom or (len(sources) == 1 and os.path.isfile(sources[0])):
+                dependencies = checker.parse_build_gradle(sources[0])
+            else:
+                boms = checker.parse_boms(sources)
+                dependencies = union_dependencies(boms)
+                print(f"  ✓ {len(dependencies)} distinct dependencies")
     except FileNotFoundError:
-        print("  ✗ Error: build.gradle.kts file not found")
+        print(f"  ✗ Error: {sources[0]} file not found")
         sys.exit(1)
     except Exception as e:
         print(f"  ✗ Error while analyzing build.gradle.kts: {e}")
@@ -399,14 +2197,101 @@ def main():
     print()
     print("Phase 4: Dependency Verification")
     print("-" * 80)
-    results = []
-    for i, (group_id, artifact_id, version) in enumerate(dependencies, 1):
-        print(f"\n[{i}/{len(dependencies)}] {group_id}:{artifact_id}:{version}")
-        result = checker.check_dependency(group_id, artifact_id, version)
-        results.append(result)
-
-    # Generate report
-    checker.generate_report(results)
+    ndjson = None
+    if args.ndjson:
+        ndjson = NdjsonWriter(args.ndjson)
+        checker.result_listeners.append(ndjson.write)
+    try:
+        if args.backend == "graphql" and not checker.offline:
+            with tracer.span("prefetch graphql"):
+                checker.prefetch_graphql(dependencies)
+        with tracer.span("verify dependencies", count=len(dependencies)):
+            # The versions of the KMP variants are checked per BOM, see bom_results()
+            results = checker.check_dependencies(dependencies, args.concurrency, {} if boms else None)
+    finally:
+        if ndjson is not None:
+            ndjson.close()
+
+    phase = 5
+    if args.behind:
+        print()
+        print(f"Phase {phase}: Releases Behind Analysis")
+        print("-" * 80)
+        phase += 1
+        if args.offline:
+            print("  ⊘ Skipped (offline mode)")
+        else:
+            with tracer.span("releases behind"):
+                requested = checker.analyze_releases_behind(results, args.max_release_pages, args.concurrency)
+            analyzed = sum(1 for r in results if r.get('releases_behind'))
+            behind = sum(1 for r in results if r.get('releases_behind') and r['releases_behind']['count'])
+            print(f"  ✓ {analyzed} dependencies analyzed with {requested} requests, {behind} behind upstream")
+
+    if args.release_notes:
+        print()
+        print(f"Phase {phase}: Release Notes")
+        print("-" * 80)
+        if checker.offline:
+            print("  ⊘ Skipped (no GitHub access)")
+        else:
+            with tracer.span("release notes"):
+                requested = checker.collect_release_notes(results, args.max_release_pages, args.concurrency)
+            collected = sum(1 for r in results if r.get('release_notes'))
+            print(f"  ✓ Release notes of {collected} outdated dependencies collected with {requested} requests")
+            try:
+                written = save_release_notes(args.release_notes, results)
+                print(f"  ✓ {written} release notes merged into {args.release_notes}")
+            except (OSError, ValueError) as e:
+                print(f"  ⚠ Could not write release notes: {e}")
+
+    if not checker.offline:
+        print(f"\n  ✓ GitHub API quota: {checker.scheduler.summary()}")
+    if checker.cache is not None:
+        try:
+            checker.cache.save()
+            print(f"  ✓ HTTP cache: {checker.cache.summary()}")
+        except OSError as e:
+            print(f"  ⚠ Could not save HTTP cache: {e}")
+    if checker.state is not None:
+        try:
+            checker.state.save()
+        except OSError as e:
+            print(f"  ⚠ Could not save check state: {e}")
+    if checker.snapshot is not None:
+        try:
+            recorded = checker.snapshot.save(args.record)
+            print(f"  ✓ Snapshot of {recorded} repositories written to {args.record}")
+        except OSError as e:
+            print(f"  ⚠ Could not write snapshot: {e}")
+
+    bom_reports = None
+    if boms:
+        by_dependency = dict(zip(dependencies, results))
+        bom_reports = [
+            (source, checker.bom_results(bom_dependencies, by_dependency)) for source, bom_dependencies in boms
+        ]
+
+    # Write machine-readable reports
+    if args.json:
+        write_json_report(args.json, results, bom_reports)
+        print(f"  ✓ JSON report written to {args.json}")
+    if args.junit:
+        write_junit_report(args.junit, results, bom_reports)
+        print(f"  ✓ JUnit report written to {args.junit}")
+    if args.ndjson and bom_reports:
+        append_bom_records(args.ndjson, bom_reports)
+        print(f"  ✓ Records of each BOM appended to {args.ndjson}")
+
+    # Generate report, exit with error code if there are issues
+    with tracer.span("report"):
+        if bom_reports is None:
+            has_issues = checker.generate_report(results)
+        else:
+            has_issues = False
+            for source, bom_results in bom_reports:
+                has_issues |= checker.generate_report(bom_results, f"BOM VERSION VERIFICATION REPORT: {source}")
+            print_bom_matrix(bom_reports)
+    sys.exit(1 if has_issues else 0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for the GitHub API endpoints used by check_versions.py.
+
+Serves /user, /repos/{org}/{repo}/releases/latest, /repos/{org}/{repo}/releases (paginated, with
+a Link header), /repos/{org}/{repo}/contents/CHANGELOG.md
+(JSON metadata with inline base64 content, or the raw file with the raw media type),
+/raw/{org}/{repo}/CHANGELOG.md and /graphql from fixtures, with configurable latency,
+error rate and rate-limit headers.
+
+Usage:
+    python fake_github_server.py [--port PORT] [--bom build.gradle.kts] [--fixtures FILE]
+                                 [--latency MS] [--jitter MS] [--error-rate RATE] [--rate-limit N]
+
+Then run the checker against it:
+    python tools/check_versions.py --api-url http://127.0.0.1:PORT
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import bom_model
+
+DEFAULT_PORT = 8765
+DEFAULT_PER_PAGE = 30
+RATE_LIMIT_WINDOW = 3600
+
+REPO_PATTERN = r'/repos/([^/]+/[^/]+)'
+GRAPHQL_REPO_PATTERN = re.compile(r'(\w+): repository\(owner: "([^"]+)", name: "([^"]+)"\)')
+
+
+def make_changelog(version: str, unreleased: str = "") -> str:
+    """Build a CHANGELOG.md fixture with an Unreleased section and one released version."""
+    return (
+        "# Changelog\n"
+        "All notable changes to this project will be documented in this file.\n\n"
+        "## [Unreleased]\n"
+        f"{unreleased}\n"
+        f"## [{version}] - 2025-01-01\n"
+        "### Fixed\n"
+        "- Initial fixture release.\n"
+    )
+
+
+def fixtures_from_bom(filepath: str) -> Dict[str, Dict]:
+    """
+    Build fixtures from a build.gradle.kts: every dependency that is not a KMP variant gets a
+    repository whose latest release is the BOM version and whose Unreleased section is empty.
+    KMP variants need none, check_versions.py looks them up in the repository of their base library.
+    """
+    fixtures = {}
+    for constraint in bom_model.load_bom(filepath).constraints:
+        if constraint.is_variant:
+            continue
+        org = constraint.group_id.replace("org.eclipse.", "eclipse-")
+        fixtures[f"{org}/{constraint.artifact_id}"] = {
+            'tag_name': constraint.version,
+            'changelog': make_changelog(constraint.version),
+        }
+    return fixtures
+
+
+class FakeGitHub:
+    """State shared by the request handlers: fixtures, failure injection, rate limit and statistics."""
+
+    def __init__(self, fixtures: Dict[str, Dict], latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: Optional[int] = None, seed: Optional[int] = None):
+        """
+        fixtures maps "org/repo" to {'tag_name': Optional[str], 'changelog': Optional[str]} and
+        optionally 'releases', all the releases, newest first ([tag_name] if absent), each given
+        by its tag name or as {'tag_name': str, 'body': str};
+        latency and jitter are in seconds, rate_limit is the quota of the core resource
+        (None for unlimited).
+        """
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.reset = int(time.time()) + RATE_LIMIT_WINDOW
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.requests_by_status: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def reset_statistics(self) -> None:
+        """Reset the request counters and the rate-limit quota."""
+        with self._lock:
+            self.requests = 0
+            self.requests_by_status = {}
+            self.remaining = self.rate_limit
+
+    def begin_request(self) -> Tuple[float, bool]:
+        """Count a request and return its (delay, inject_error) settings."""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            inject_error = self.random.random() < self.error_rate
+        return delay, inject_error
+
+    def consume_quota(self, conditional_hit: bool) -> Optional[Dict[str, str]]:
+        """
+        Consume one request of the quota and return the rate-limit headers, or None when the
+        quota is exhausted. 304 answers do not count against the quota, as on GitHub.
+        """
+        with self._lock:
+            if self.rate_limit is None:
+                return {}
+            if not conditional_hit:
+                if self.remaining <= 0:
+                    return None
+                self.remaining -= 1
+            return {
+                'X-RateLimit-Limit': str(self.rate_limit),
+                'X-RateLimit-Remaining': str(self.remaining),
+                'X-RateLimit-Reset': str(self.reset),
+                'X-RateLimit-Resource': 'core',
+            }
+
+    def record_status(self, status: int) -> None:
+        """Count an answer by status."""
+        with self._lock:
+            self.requests_by_status[status] = self.requests_by_status.get(status, 0) + 1
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Request handler answering from the FakeGitHub bound to the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def github(self) -> FakeGitHub:
+        return self.server.github
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        match = re.fullmatch(REPO_PATTERN + r'/releases', url.path)
+        if match:
+            body, status, headers = self.releases_page(match.group(1), parse_qs(url.query))
+            self.respond(status, body, headers=headers)
+            return
+        body, status, content_type = self.route_get()
+        self.respond(status, body, content_type)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        if self.path != '/graphql':
+            self.respond(404, {'message': 'Not Found'})
+            return
+        self.respond(200, self.graphql(payload.get('query', '')))
+
+    def route_get(self) -> Tuple[object, int, str]:
+        """Return the (body, status, content type) answering a GET request."""
+        json_type = 'application/json; charset=utf-8'
+        if self.path == '/user':
+            return {'login': 'fake-user'}, 200, json_type
+
+        match = re.fullmatch(REPO_PATTERN + r'/releases/latest', self.path)
+        if match:
+            fixture = self.github.fixtures.get(match.group(1))
+            if not fixture or not fixture.get('tag_name'):
+                return {'message': 'Not Found'}, 404, json_type
+            return {'tag_name': fixture['tag_name']}, 200, json_type
+
+        match = re.fullmatch(REPO_PATTERN + r'/contents/CHANGELOG\.md', self.path)
+        if match:
+            changelog = self.changelog_of(match.group(1))
+            if changelog is None:
+                return {'message': 'Not Found'}, 404, json_type
+            if 'raw' in self.headers.get('Accept', ''):
+                return changelog, 200, 'text/plain; charset=utf-8'
+            host = self.headers.get('Host', 'localhost')
+            return {
+                'name': 'CHANGELOG.md',
+                'encoding': 'base64',
+                'content': base64.b64encode(changelog.encode('utf-8')).decode('ascii'),
+                'download_url': f"http://{host}/raw/{match.group(1)}/CHANGELOG.md",
+            }, 200, json_type
+
+        match = re.fullmatch(r'/raw/([^/]+/[^/]+)/CHANGELOG\.md', self.path)
+        if match:
+            changelog = self.changelog_of(match.group(1))
+            if changelog is None:
+                return '404: Not Found', 404, 'text/plain; charset=utf-8'
+            return changelog, 200, 'text/plain; charset=utf-8'
+
+        return {'message': 'Not Found'}, 404, json_type
+
+    def releases_page(self, repo: str, query: Dict[str, List[str]]) -> Tuple[object, int, Dict[str, str]]:
+        """Return the (body, status, headers) of a page of the releases of a repository, newest first."""
+        fixture = self.github.fixtures.get(repo)
+        if fixture is None:
+            return {'message': 'Not Found'}, 404, {}
+        tags = fixture.get('releases')
+        if tags is None:
+            tags = [fixture['tag_name']] if fixture.get('tag_name') else []
+        per_page = int(query.get('per_page', [DEFAULT_PER_PAGE])[0])
+        page = int(query.get('page', ['1'])[0])
+        last_page = max(1, -(-len(tags) // per_page))
+        releases = []
+        for release in tags[(page - 1) * per_page:page * per_page]:
+            if isinstance(release, str):
+                release = {'tag_name': release, 'body': f"### Changed\n- Release {release}.\n"}
+            releases.append({
+                'tag_name': release['tag_name'],
+                'body': release.get('body', ''),
+                'draft': False,
+                'prerelease': '-' in release['tag_name'],
+            })
+        headers = {}
+        if last_page > 1:
+            host = self.headers.get('Host', 'localhost')
+            base = f"http://{host}/repos/{repo}/releases?per_page={per_page}"
+            links = []
+            if page < last_page:
+                links.append(f'<{base}&page={page + 1}>; rel="next"')
+            links.append(f'<{base}&page={last_page}>; rel="last"')
+            headers['Link'] = ', '.join(links)
+        return releases, 200, headers
+
+    def changelog_of(self, repo: str) -> Optional[str]:
+        """Return the CHANGELOG.md fixture of a repository."""
+        fixture = self.github.fixtures.get(repo)
+        return fixture.get('changelog') if fixture else None
+
+    def graphql(self, query: str) -> Dict:
+        """Answer the repository aliases of a check_versions.py GraphQL query."""
+        data = {}
+        errors = []
+        for alias, owner, name in GRAPHQL_REPO_PATTERN.findall(query):
+            fixture = self.github.fixtures.get(f"{owner}/{name}")
+            if fixture is None:
+                data[alias] = None
+                errors.append({'type': 'NOT_FOUND', 'path': [alias],
+                               'message': f"Could not resolve to a Repository with the name '{owner}/{name}'."})
+                continue
+            tag_name = fixture.get('tag_name')
+            changelog = fixture.get('changelog')
+            data[alias] = {
+                'latestRelease': {'tagName': tag_name} if tag_name else None,
+                'changelog': {'text': changelog} if changelog is not None else None,
+            }
+        result = {'data': data}
+        if errors:
+            result['errors'] = errors
+        return result
+
+    def respond(self, status: int, body, content_type: str = 'application/json; charset=utf-8',
+                headers: Optional[Dict[str, str]] = None) -> None:
+        """Send an answer with its extra `headers`, applying the latency, error and rate-limit settings."""
+        extra_headers = headers or {}
+        delay, inject_error = self.github.begin_request()
+        if delay > 0:
+            time.sleep(delay)
+
+        if isinstance(body, str):
+            payload = body.encode('utf-8')
+        else:
+            payload = json.dumps(body).encode('utf-8')
+        etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+        conditional_hit = status == 200 and self.headers.get('If-None-Match') == etag
+
+        headers = self.github.consume_quota(conditional_hit)
+        if inject_error:
+            status, payload, headers = 502, b'{"message": "Server Error"}', headers or {}
+        elif headers is None:
+            status, payload = 403, b'{"message": "API rate limit exceeded"}'
+            headers = {
+                'X-RateLimit-Limit': str(self.github.rate_limit),
+                'X-RateLimit-Remaining': '0',
+                'X-RateLimit-Reset': str(self.github.reset),
+                'X-RateLimit-Resource': 'core',
+            }
+        elif conditional_hit:
+            status, payload = 304, b''
+
+        self.github.record_status(status)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status == 200:
+            for name, value in extra_headers.items():
+                self.send_header(name, value)
+        if status in (200, 304):
+            self.send_header('ETag', etag)
+        self.send_header('Content-Type', content_type if status == 200 else 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class FakeGitHubServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to a FakeGitHub."""
+
+    daemon_threads = True
+
+    def __init__(self, github: FakeGitHub, port: int = 0, host: str = "127.0.0.1"):
+        super().__init__((host, port), FakeGitHubHandler)
+        self.github = github
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self) -> "FakeGitHubServer":
+        """Serve in a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Serve fake GitHub API answers for check_versions.py.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"listening port (default: {DEFAULT_PORT})")
+    parser.add_argument("--bom", default="build.gradle.kts",
+                        help="BOM file generating the fixtures (default: build.gradle.kts)")
+    parser.add_argument("--fixtures",
+                        help='JSON file mapping "org/repo" to {"tag_name": ..., "changelog": ...}, '
+                             'used instead of --bom')
+    parser.add_argument("--latency", type=float, default=0.0, help="latency of each answer in ms (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency in ms (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of answers replaced by a 502 error (default: 0)")
+    parser.add_argument("--rate-limit", type=int, help="core rate-limit quota (default: unlimited)")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    if args.fixtures:
+        with open(args.fixtures, 'r', encoding='utf-8') as f:
+            fixtures = json.load(f)
+    else:
+        fixtures = fixtures_from_bom(args.bom)
+
+    github = FakeGitHub(fixtures, args.latency / 1000, args.jitter / 1000, args.error_rate, args.rate_limit)
+    server = FakeGitHubServer(github, args.port)
+    print(f"Fake GitHub API serving {len(fixtures)} repositories on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"{github.requests} requests served")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Index of the artifact versions available in a local Maven repository.
+
+The `org/eclipse/keyple` and `org/eclipse/keypop` directories of the repository are scanned:
+the versions of each artifact come from its `maven-metadata*.xml` files and from its version
+directories holding artifact files. The index is persisted, and an artifact is scanned again
+only when its directory, one of its metadata files or one of its version directories changed
+since the previous scan.
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+
+import maven_version
+from atomic_file import write_atomically
+
+DEFAULT_REPOSITORY = os.path.join(os.path.expanduser("~"), ".m2", "repository")
+DEFAULT_INDEX_FILE = os.path.join(os.path.expanduser("~"), ".cache", "keyple-java-bom", "maven-index.json")
+INDEXED_GROUPS = ("org.eclipse.keyple", "org.eclipse.keypop")
+# Version 2: versions sorted in the Maven order
+# Version 3: version directories in the artifact signatures
+INDEX_FORMAT_VERSION = 3
+
+METADATA_PATTERN = re.compile(r'maven-metadata(-[\w.-]+)?\.xml$')
+# A version directory without any of these files is a failed or partial download
+ARTIFACT_EXTENSIONS = ('.pom', '.jar', '.module', '.aar', '.klib')
+
+
+def read_metadata_versions(path: str) -> List[str]:
+    """Return the versions listed by a maven-metadata.xml file, empty if it is unreadable."""
+    try:
+        root = ElementTree.parse(path).getroot()
+    except (OSError, ElementTree.ParseError):
+        return []
+    return [
+        element.text.strip() for element in root.iter()
+        if element.tag.rsplit('}', 1)[-1] == 'version' and element.text and element.text.strip()
+    ]
+
+
+class MavenIndex:
+    """
+    Versions available per "groupId:artifactId" in a local Maven repository.
+
+    Each artifact entry keeps the signature of its directory (mtime of the directory, of its
+    metadata files and of its version directories) with its versions, in the Maven order;
+    refresh() reuses the entries whose signature did not change. A version directory changes
+    when a download completes in it, so a version skipped as partial is picked up later.
+    """
+
+    def __init__(self, repository: str = DEFAULT_REPOSITORY, index_path: Optional[str] = DEFAULT_INDEX_FILE,
+                 groups: Tuple[str, ...] = INDEXED_GROUPS):
+        self.repository = repository
+        self.index_path = index_path
+        self.groups = groups
+        self.artifacts: Dict[str, Dict] = {}
+        self.scanned = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """Load the persisted index, starting empty if it is missing, corrupted or for another repository."""
+        if not self.index_path:
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data['format'] == INDEX_FORMAT_VERSION and data['repository'] == os.path.abspath(self.repository):
+                self.artifacts = data['artifacts']
+        except (OSError, ValueError, KeyError, TypeError):
+            self.artifacts = {}
+
+    def save(self) -> None:
+        """Write the index atomically."""
+        if not self.index_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+        data = {
+            'format': INDEX_FORMAT_VERSION,
+            'repository': os.path.abspath(self.repository),
+            'artifacts': self.artifacts,
+        }
+        write_atomically(self.index_path, lambda f: json.dump(data, f, sort_keys=True))
+
+    def refresh(self) -> None:
+        """Scan the artifacts whose directory changed since the last scan, and drop the deleted ones."""
+        self.scanned = 0
+        self.reused = 0
+        artifacts = {}
+        for group_id in self.groups:
+            group_dir = os.path.join(self.repository, *group_id.split('.'))
+            try:
+                entries = list(os.scandir(group_dir))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                key = f"{group_id}:{entry.name}"
+                signature, metadata_files = self._signature(entry.path)
+                previous = self.artifacts.get(key)
+                if previous is not None and previous['signature'] == signature:
+                    artifacts[key] = previous
+                    self.reused += 1
+                    continue
+                versions = self._scan_artifact(entry.path, metadata_files)
+                if versions:
+                    artifacts[key] = {'signature': signature, 'versions': versions}
+                self.scanned += 1
+        with self._lock:
+            self.artifacts = artifacts
+
+    @staticmethod
+    def _signature(artifact_dir: str) -> Tuple[List[int], List[str]]:
+        """Return the signature of an artifact directory and the paths of its metadata files."""
+        signature = [os.stat(artifact_dir).st_mtime_ns]
+        metadata_files = []
+        for entry in sorted(os.scandir(artifact_dir), key=lambda e: e.name):
+            if entry.is_file() and METADATA_PATTERN.match(entry.name):
+                metadata_files.append(entry.path)
+                signature.append(entry.stat().st_mtime_ns)
+            elif entry.is_dir():
+                signature.append(entry.stat().st_mtime_ns)
+        return signature, metadata_files
+
+    @staticmethod
+    def _scan_artifact(artifact_dir: str, metadata_files: List[str]) -> List[str]:
+        """Return the sorted versions of an artifact, from its metadata and its version directories."""
+        versions = set()
+        for path in metadata_files:
+            versions.update(read_metadata_versions(path))
+        for entry in os.scandir(artifact_dir):
+            if not entry.is_dir():
+                continue
+            try:
+                if any(name.endswith(ARTIFACT_EXTENSIONS) for name in os.listdir(entry.path)):
+                    versions.add(entry.name)
+            except OSError:
+                continue
+        return maven_version.sort_versions(versions)
+
+    def versions(self, group_id: str, artifact_id: str) -> List[str]:
+        """Return the versions of an artifact, oldest first."""
+        with self._lock:
+            entry = self.artifacts.get(f"{group_id}:{artifact_id}")
+        return list(entry['versions']) if entry else []
+
+    def latest(self, group_id: str, artifact_id: str, include_snapshots: bool = False) -> Optional[str]:
+        """Return the latest version of an artifact, or None if it is not in the repository."""
+        for version in reversed(self.versions(group_id, artifact_id)):
+            if include_snapshots or not maven_version.is_snapshot(version):
+                return version
+        return None
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Version ordering of Maven (org.apache.maven.artifact.versioning.ComparableVersion).
+
+A version is split into numeric and qualifier items at '.', '-' and at the transitions between
+digits and letters; '-' and transitions open a sub-list. Trailing null items ("0", "final",
+"ga", "release", "") are dropped, so "1", "1.0" and "1.0.0" are equal. Known qualifiers are
+ordered alpha < beta < milestone < rc = cr < snapshot < "" (release) < sp, and unknown
+qualifiers come after them, in lexical order:
+
+    1-alpha2 < 1-beta1 < 1-m1 < 1-rc1 < 1-SNAPSHOT < 1 < 1-sp < 1-abc < 1-1 < 1.1
+
+Parsed versions are memoized in a bounded cache.
+"""
+
+from functools import lru_cache, total_ordering
+from itertools import zip_longest
+from typing import Iterable, List, Optional, Tuple, Union
+
+# Number of parsed versions kept by parse_version()
+VERSION_CACHE_SIZE = 4096
+
+QUALIFIERS = ["alpha", "beta", "milestone", "rc", "snapshot", "", "sp"]
+QUALIFIER_ALIASES = {"ga": "", "final": "", "release": "", "cr": "rc"}
+# Single letters directly followed by a digit, as in "1.0a1"
+QUALIFIER_SHORTCUTS = {"a": "alpha", "b": "beta", "m": "milestone"}
+RELEASE_QUALIFIER = str(QUALIFIERS.index(""))
+
+# An item is an int, a Qualifier or a tuple of items (sub-list)
+Item = Union[int, "Qualifier", Tuple]
+
+
+class Qualifier(str):
+    """A qualifier item, holding its comparable form."""
+
+    @classmethod
+    def of(cls, value: str, followed_by_digit: bool = False) -> "Qualifier":
+        if followed_by_digit and len(value) == 1:
+            value = QUALIFIER_SHORTCUTS.get(value, value)
+        value = QUALIFIER_ALIASES.get(value, value)
+        if value in QUALIFIERS:
+            return cls(str(QUALIFIERS.index(value)))
+        return cls(f"{len(QUALIFIERS)}-{value}")
+
+
+def _is_null(item: Item) -> bool:
+    if isinstance(item, Qualifier):
+        return item == RELEASE_QUALIFIER
+    if isinstance(item, int):
+        return item == 0
+    return len(item) == 0
+
+
+def _compare(item: Item, other: Optional[Item]) -> int:
+    """Compare two items, `other` being None when the other version has no item at this position."""
+    if isinstance(item, Qualifier):
+        if other is None:
+            return (item > RELEASE_QUALIFIER) - (item < RELEASE_QUALIFIER)
+        if isinstance(other, Qualifier):
+            return (item > other) - (item < other)
+        # A qualifier is lower than a number and than a sub-list
+        return -1
+    if isinstance(item, int):
+        if other is None:
+            return 0 if item == 0 else 1
+        if isinstance(other, int):
+            return (item > other) - (item < other)
+        return 1
+    # Sub-list
+    if other is None:
+        return _compare(item[0], None) if item else 0
+    if isinstance(other, Qualifier):
+        return 1
+    if isinstance(other, int):
+        return -1
+    for left, right in zip_longest(item, other):
+        result = -_compare(right, None) if left is None else _compare(left, right)
+        if result:
+            return result
+    return 0
+
+
+def _parse_number(value: str, is_digit: bool) -> Item:
+    return int(value) if is_digit else Qualifier.of(value)
+
+
+def _normalize(items: List) -> None:
+    """Drop the trailing null items, sub-lists excepted."""
+    for i in range(len(items) - 1, -1, -1):
+        if _is_null(items[i]):
+            del items[i]
+        elif not isinstance(items[i], list):
+            break
+
+
+def _freeze(items: List) -> Tuple:
+    return tuple(_freeze(item) if isinstance(item, list) else item for item in items)
+
+
+def _parse_items(version: str) -> Tuple:
+    """Split a version into its items, as ComparableVersion.parseVersion() does."""
+    version = version.lower()
+    root: List = []
+    current = root
+    lists = [root]
+    is_digit = False
+    start = 0
+
+    def open_list() -> List:
+        sub_list: List = []
+        current.append(sub_list)
+        lists.append(sub_list)
+        return sub_list
+
+    for i, char in enumerate(version):
+        if char == '.':
+            current.append(0 if i == start else _parse_number(version[start:i], is_digit))
+            start = i + 1
+        elif char == '-':
+            current.append(0 if i == start else _parse_number(version[start:i], is_digit))
+            start = i + 1
+            current = open_list()
+        elif '0' <= char <= '9':
+            if not is_digit and i > start:
+                current.append(Qualifier.of(version[start:i], followed_by_digit=True))
+                start = i
+                current = open_list()
+            is_digit = True
+        else:
+            if is_digit and i > start:
+                current.append(_parse_number(version[start:i], True))
+                start = i
+                current = open_list()
+            is_digit = False
+    if len(version) > start:
+        current.append(_parse_number(version[start:], is_digit))
+
+    # Sub-lists are normalized before the lists containing them
+    for items in reversed(lists):
+        _normalize(items)
+    return _freeze(root)
+
+
+@total_ordering
+class MavenVersion:
+    """A parsed version, ordered as Maven orders versions."""
+
+    __slots__ = ('value', 'items')
+
+    def __init__(self, value: str):
+        self.value = value
+        self.items = _parse_items(value)
+
+    def compare(self, other: "MavenVersion") -> int:
+        """Return -1, 0 or 1 as this version is lower than, equal to or greater than `other`."""
+        return _compare(self.items, other.items)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MavenVersion) and self.items == other.items
+
+    def __lt__(self, other: "MavenVersion") -> bool:
+        return self.compare(other) < 0
+
+    def __hash__(self) -> int:
+        return hash(self.items)
+
+    def __repr__(self) -> str:
+        return f"MavenVersion({self.value!r})"
+
+    def release_components(self, count: int = 3) -> Tuple[int, ...]:
+        """The leading numeric components (major, minor, ...), padded with zeros."""
+        numbers = []
+        for item in self.items:
+            if not isinstance(item, int) or len(numbers) == count:
+                break
+            numbers.append(item)
+        return tuple(numbers) + (0,) * (count - len(numbers))
+
+
+@lru_cache(maxsize=VERSION_CACHE_SIZE)
+def parse_version(version: str) -> MavenVersion:
+    """Parse a version, memoized."""
+    return MavenVersion(version)
+
+
+def compare_versions(version: str, other: str) -> int:
+    """Return -1, 0 or 1 as `version` is lower than, equal to or greater than `other`."""
+    return parse_version(version).compare(parse_version(other))
+
+
+def is_snapshot(version: str) -> bool:
+    return version.upper().endswith("-SNAPSHOT")
+
+
+def sort_versions(versions: Iterable[str], reverse: bool = False) -> List[str]:
+    """Sort versions, oldest first unless `reverse`."""
+    return sorted(versions, key=parse_version, reverse=reverse)
+
+
+def max_version(versions: Iterable[str], include_snapshots: bool = True) -> Optional[str]:
+    """Return the greatest version, or None if there is none."""
+    candidates = [v for v in versions if include_snapshots or not is_snapshot(v)]
+    return max(candidates, key=parse_version) if candidates else None
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Release notes of the BOM dependencies, shared by both tools.
+
+`check_versions.py --release-notes` collects the bodies of the GitHub releases newer than the
+version of each outdated dependency and merges them into a notes file, which accumulates across
+runs. `update_changelog.py --notes` reads it to summarize, in a Notes column, the releases
+between the previous and the new version of each updated component.
+"""
+
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import maven_version
+from atomic_file import write_atomically
+
+DEFAULT_NOTES_FILE = ".release_notes.json"
+NOTES_FORMAT_VERSION = 1
+# Maximum length of a summary, see summarize()
+SUMMARY_MAX_LENGTH = 120
+
+BULLET_PATTERN = re.compile(r'[-*+]\s+(.*\S)')
+HEADING_PATTERN = re.compile(r'#+\s')
+LINK_PATTERN = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+
+
+class ReleaseNotes:
+    """Release bodies by "groupId:artifactId", then by version."""
+
+    def __init__(self, artifacts: Optional[Dict[str, Dict[str, str]]] = None):
+        self.artifacts: Dict[str, Dict[str, str]] = artifacts or {}
+
+    @classmethod
+    def load(cls, path: str) -> "ReleaseNotes":
+        """Load a notes file; raises ValueError if it is not a notes file."""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get('format') != NOTES_FORMAT_VERSION:
+            raise ValueError(f"{path} is not a release notes file of format {NOTES_FORMAT_VERSION}")
+        return cls(data['artifacts'])
+
+    def save(self, path: str) -> None:
+        """Write the notes atomically."""
+        data = {'format': NOTES_FORMAT_VERSION, 'artifacts': self.artifacts}
+        write_atomically(path, lambda f: json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True))
+
+    def add(self, group_id: str, artifact_id: str, version: str, body: str) -> None:
+        self.artifacts.setdefault(f"{group_id}:{artifact_id}", {})[version] = body
+
+    def between(self, group_id: str, artifact_id: str, old_version: str, new_version: str) -> List[Tuple[str, str]]:
+        """Return the (version, body) of the releases after `old_version` up to `new_version`, oldest first."""
+        notes = self.artifacts.get(f"{group_id}:{artifact_id}", {})
+        versions = [
+            version for version in notes
+            if maven_version.compare_versions(version, old_version) > 0
+            and maven_version.compare_versions(version, new_version) <= 0
+        ]
+        return [(version, notes[version]) for version in maven_version.sort_versions(versions)]
+
+
+def summarize(bodies: Iterable[str], max_length: int = SUMMARY_MAX_LENGTH) -> str:
+    """
+    Summarize release bodies on one line: their bullet items, or the first line of a body
+    without any, joined with "; " and cut at `max_length` characters. Markdown links are
+    reduced to their text and "|" is escaped for a table cell.
+    """
+    items: List[str] = []
+    for body in bodies:
+        lines = [line.strip() for line in body.splitlines()]
+        lines = [line for line in lines if line and not HEADING_PATTERN.match(line)]
+        bullets = [match.group(1) for match in map(BULLET_PATTERN.match, lines) if match]
+        for item in bullets or lines[:1]:
+            item = LINK_PATTERN.sub(r'\1', item)
+            if item not in items:
+                items.append(item)
+    summary = "; ".join(items)
+    if len(summary) > max_length:
+        summary = summary[:max_length - 1].rstrip() + "…"
+    return summary.replace('|', '\\|')
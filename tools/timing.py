@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Span timings of the tool phases and HTTP calls.
+
+A Tracer records named spans (start, duration, thread and arguments such as the HTTP status).
+The spans can be exported as a Chrome trace-event file, to be opened with chrome://tracing or
+https://ui.perfetto.dev, and summarized as a table of count/total/mean/max time per span name,
+followed by the slowest individual spans. Span names are generic ("check dependency"), the
+item a span is about is given by its 'target' argument.
+A disabled tracer records nothing and costs a no-op context manager per span.
+"""
+
+import contextlib
+import cProfile
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Number of span names and of slowest spans shown by print_summary()
+SUMMARY_TOP = 20
+SLOWEST_TOP = 10
+
+
+@dataclass
+class Span:
+    """A timed span, in seconds since the tracer origin."""
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread_id: int
+    args: Dict = field(default_factory=dict)
+
+
+class Tracer:
+    """Thread-safe recorder of timed spans."""
+
+    def __init__(self, enabled: bool = True, clock: Callable[[], float] = time.perf_counter):
+        self.enabled = enabled
+        self.clock = clock
+        self.origin = clock()
+        self.spans: List[Span] = []
+        self.thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "phase", **args) -> Iterator[Dict]:
+        """
+        Time the enclosed block. Yields the span arguments, which the block may complete
+        (e.g. with a status); an escaping exception is recorded in the 'error' argument.
+        """
+        if not self.enabled:
+            yield args
+            return
+        start = self.clock()
+        try:
+            yield args
+        except BaseException as e:
+            args['error'] = type(e).__name__
+            raise
+        finally:
+            self.add(name, category, start, self.clock() - start, args)
+
+    def add(self, name: str, category: str, start: float, duration: float, args: Optional[Dict] = None) -> None:
+        """
+        Record a span measured by the caller, `start` being a clock() value. The span keeps the
+        `args` dict: arguments completed after the span, such as the size of a body read later,
+        are exported too.
+        """
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        span = Span(name, category, start - self.origin, duration, thread.ident, args if args is not None else {})
+        with self._lock:
+            self.spans.append(span)
+            self.thread_names.setdefault(thread.ident, thread.name)
+
+    def summary(self) -> List[Tuple[str, str, int, float, float, float]]:
+        """
+        Aggregate the spans by name.
+        Returns (name, category, count, total, mean, max) tuples, the longest total first.
+        """
+        groups: Dict[str, List[Span]] = {}
+        with self._lock:
+            for span in self.spans:
+                groups.setdefault(span.name, []).append(span)
+        rows = []
+        for name, spans in groups.items():
+            durations = [span.duration for span in spans]
+            total = sum(durations)
+            rows.append((name, spans[0].category, len(spans), total, total / len(spans), max(durations)))
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows
+
+    def slowest(self, top: int = SLOWEST_TOP) -> List[Span]:
+        """Return the `top` longest spans having a 'target' argument."""
+        with self._lock:
+            spans = [span for span in self.spans if 'target' in span.args]
+        spans.sort(key=lambda span: span.duration, reverse=True)
+        return spans[:top]
+
+    def print_summary(self, top: int = SUMMARY_TOP) -> None:
+        """Print the `top` span names with the longest total time, then the slowest spans."""
+        rows = self.summary()
+        print("\n" + "="*80)
+        print("TIMINGS")
+        print("="*80)
+        print(f"  {'Span':<44} {'Count':>5} {'Total':>9} {'Mean':>9} {'Max':>9}")
+        print("-" * 80)
+        for name, category, count, total, mean, maximum in rows[:top]:
+            label = f"[{category}] {name}"
+            if len(label) > 44:
+                label = label[:41] + "..."
+            print(f"  {label:<44} {count:>5} {total * 1000:>7.0f}ms {mean * 1000:>7.1f}ms {maximum * 1000:>7.1f}ms")
+        if len(rows) > top:
+            print(f"  ... {len(rows) - top} more span names in the trace")
+
+        slowest = self.slowest()
+        if slowest:
+            print("-" * 80)
+            print(f"  {'Slowest':<54} {'Duration':>9}  Details")
+            print("-" * 80)
+            for span in slowest:
+                label = f"[{span.category}] {span.args['target']}"
+                if len(label) > 54:
+                    label = "..." + label[-51:]
+                details = ", ".join(f"{key}={value}" for key, value in span.args.items() if key != 'target')
+                print(f"  {label:<54} {span.duration * 1000:>7.1f}ms  {details}")
+        print("="*80)
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Write the spans as a Chrome trace-event JSON file."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+            thread_names = dict(self.thread_names)
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in thread_names.items()
+        ]
+        for span in spans:
+            events.append({
+                'name': span.name,
+                'cat': span.category,
+                'ph': 'X',
+                'ts': round(span.start * 1e6, 1),
+                'dur': round(span.duration * 1e6, 1),
+                'pid': pid,
+                'tid': span.thread_id,
+                'args': span.args,
+            })
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+
+
+@contextlib.contextmanager
+def profiled(path: Optional[str]) -> Iterator[None]:
+    """Run the enclosed block under cProfile and dump the statistics to `path`, if given."""
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"  ✓ Profile written to {path} (python -m pstats {path})")
+
+
+def report(tracer: Tracer, trace_path: Optional[str] = None, show_summary: bool = False) -> None:
+    """Export the trace and print the summary table, as requested."""
+    if not tracer.enabled:
+        return
+    if show_summary:
+        tracer.print_summary()
+    if trace_path:
+        try:
+            tracer.write_chrome_trace(trace_path)
+            print(f"  ✓ Trace written to {trace_path} ({len(tracer.spans)} spans)")
+        except OSError as e:
+            print(f"  ⚠ Could not write trace: {e}")
@@ -3,17 +3,35 @@
 Script to automatically update CHANGELOG.md from build.gradle.kts changes.
 
 Usage:
-    python update_changelog.py [YYYY.MM.DD]
+    python update_changelog.py [YYYY.MM.DD] [--notes FILE] [--trace FILE] [--timings] [--profile FILE]
+    python update_changelog.py --backfill {tags,commits} [--output FILE] [--jobs N]
+    python update_changelog.py --watch [--preview FILE] [--interval SECONDS] [YYYY.MM.DD]
 
 If no date is provided, uses today's date.
+The backfill mode regenerates the sections of all the BOM revisions found in the git history.
+The watch mode keeps a preview of the next section up to date while the files are edited.
+With --notes, the new section gets a Notes column summarizing the release notes collected by
+check_versions.py --release-notes.
 """
 
+import argparse
+import os
 import re
+import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, TextIO, Tuple, Optional
 from dataclasses import dataclass
 
+import bom_model
+from atomic_file import write_atomically
+import maven_version
+import release_notes
+import timing
+from changelog_index import ChangelogEntry, ChangelogIndex
+
 
 @dataclass
 class Dependency:
@@ -24,124 +42,51 @@ class Dependency:
     group_id: str
 
 
-@dataclass
-class ChangelogEntry:
-    """Represents an entry in the changelog."""
-    name: str
-    version: str
-    status: str
-    prev_version: str
-    category: str = ""
+VERSION_FORMAT_PATTERN = re.compile(r'^\d{4}\.\d{2}\.\d{2}$')
+DEFAULT_REPOSITORY = "eclipse-keyple/keyple-java-bom"
+
+# Watch mode defaults
+DEFAULT_PREVIEW = "CHANGELOG.preview.md"
+DEFAULT_POLL_INTERVAL = 1.0
 
 
 class BuildGradleParser:
     """Parser for build.gradle.kts file."""
 
-    CATEGORY_MAPPING = {
-        "Keypop": "**Keypop Dependencies**",
-        "Keyple core": "**Keyple Core**",
-        "Keyple distributed": "**Keyple Distributed**",
-        "Keyple interop": "**Keyple Interop**",
-        "Keyple card extensions": "**Keyple Card Extensions**",
-        "Keyple reader plugins": "**Keyple Reader Plugins**",
-    }
+    CATEGORY_MAPPING = bom_model.CATEGORY_MAPPING
 
     # Patterns for KMP library variants to exclude from individual listing
-    KMP_VARIANT_SUFFIXES = [
-        "-jvm", "-android", "-iosarm64", "-iossimulatorarm64", "-iosx64"
-    ]
+    KMP_VARIANT_SUFFIXES = bom_model.KMP_VARIANT_SUFFIXES
 
     def __init__(self, filepath: str):
         self.filepath = filepath
         self.dependencies: List[Dependency] = []
 
     def parse(self) -> List[Dependency]:
-        """Parse the build.gradle.kts file and extract dependencies."""
-        with open(self.filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        current_category = None
-        dependencies_by_base = {}  # Track base libraries for KMP grouping
-
-        # Extract the dependencies block
-        constraints_match = re.search(r'constraints\s*\{(.*?)\}', content, re.DOTALL)
-        if not constraints_match:
-            return []
-
-        constraints_block = constraints_match.group(1)
-        lines = constraints_block.split('\n')
-
-        for line in lines:
-            line = line.strip()
-
-            # Check for category comment
-            if line.startswith('//'):
-                category_name = line.lstrip('/').strip()
-                current_category = self.CATEGORY_MAPPING.get(category_name, category_name)
-                continue
-
-            # Parse api() lines
-            api_match = re.match(r'api\("([^:]+):([^:]+):([^"]+)"\)', line)
-            if api_match and current_category:
-                group_id = api_match.group(1)
-                artifact_id = api_match.group(2)
-                version = api_match.group(3)
-
-                # Check if this is a KMP variant
-                base_artifact = artifact_id
-                is_variant = False
-                for suffix in self.KMP_VARIANT_SUFFIXES:
-                    if artifact_id.endswith(suffix):
-                        base_artifact = artifact_id[:artifact_id.rfind(suffix)]
-                        is_variant = True
-                        break
-
-                # Only add the base library, not variants
-                if not is_variant:
-                    dep = Dependency(
-                        artifact_id=artifact_id,
-                        version=version,
-                        category=current_category,
-                        group_id=group_id
-                    )
-                    dependencies_by_base[artifact_id] = dep
-                elif base_artifact not in dependencies_by_base:
-                    # If we encounter a variant before the base, add the base
-                    dep = Dependency(
-                        artifact_id=base_artifact,
-                        version=version,
-                        category=current_category,
-                        group_id=group_id
-                    )
-                    dependencies_by_base[base_artifact] = dep
-
-        # Preserve order by re-parsing and keeping only base libraries
-        result = []
-        current_category = None
-
-        for line in lines:
-            line = line.strip()
-
-            if line.startswith('//'):
-                category_name = line.lstrip('/').strip()
-                current_category = self.CATEGORY_MAPPING.get(category_name, category_name)
-                continue
+        """
+        Parse the build.gradle.kts file and extract dependencies.
+        KMP library variants are grouped under their base library.
+        """
+        self.dependencies = self.to_dependencies(bom_model.load_bom(self.filepath))
+        return self.dependencies
 
-            api_match = re.match(r'api\("([^:]+):([^:]+):([^"]+)"\)', line)
-            if api_match and current_category:
-                artifact_id = api_match.group(2)
-
-                # Check if this is a base library (not a variant)
-                is_base = True
-                for suffix in self.KMP_VARIANT_SUFFIXES:
-                    if artifact_id.endswith(suffix):
-                        is_base = False
-                        break
-
-                if is_base and artifact_id in dependencies_by_base:
-                    result.append(dependencies_by_base[artifact_id])
+    @staticmethod
+    def parse_content(content: str) -> List[Dependency]:
+        """Extract the dependencies of a build.gradle.kts content."""
+        return BuildGradleParser.to_dependencies(bom_model.parse_bom_content(content))
 
-        return result
+    @staticmethod
+    def to_dependencies(model: bom_model.BomModel) -> List[Dependency]:
+        """Convert the base libraries of a BOM model to dependencies."""
+        return [
+            Dependency(
+                artifact_id=constraint.artifact_id,
+                version=constraint.version,
+                category=constraint.category,
+                group_id=constraint.group_id
+            )
+            for constraint in model.libraries
+        ]
 
 
 class ChangelogParser:
@@ -152,88 +97,19 @@ class ChangelogParser:
 
     def parse_latest_version(self) -> Tuple[Optional[str], Dict[str, ChangelogEntry]]:
         """Parse the latest version section and return version number and entries."""
-        with open(self.filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Find the [Unreleased] section first
-        unreleased_match = re.search(r'\n## \[Unreleased\]', content)
-        if not unreleased_match:
-            return None, {}
-
-        # Find the first version section after [Unreleased]
-        search_start = unreleased_match.end()
-        version_match = re.search(r'\n## \[(\d{4}\.\d{2}\.\d{2})\]', content[search_start:])
-        if not version_match:
+        latest = ChangelogIndex.read_latest(self.filepath)
+        if latest is None:
             return None, {}
-
-        version = version_match.group(1)
-
-        # Extract the section content until the next ## or end of file
-        section_start = search_start + version_match.end()
-        next_section = re.search(r'\n## \[', content[section_start:])
-        if next_section:
-            section_end = section_start + next_section.start()
-        else:
-            # Look for the reference links section
-            refs_match = re.search(r'\n\[Unreleased\]:', content[section_start:])
-            if refs_match:
-                section_end = section_start + refs_match.start()
-            else:
-                section_end = len(content)
-
-        section_content = content[section_start:section_end]
-
-        # Parse the table
-        entries = {}
-        lines = section_content.split('\n')
-        in_table = False
-        current_category = ""
-
-        for line in lines:
-            if line.startswith('|') and '---' in line:
-                in_table = True
-                continue
-
-            if in_table and line.startswith('|'):
-                # Parse table row
-                cells = [cell.strip() for cell in line.split('|')[1:-1]]
-                if len(cells) >= 2:
-                    name = cells[0].strip()
-
-                    # Check if this is a category header
-                    if '**' in name:
-                        current_category = name
-                        continue
-
-                    # Skip empty rows
-                    if not name or not cells[1].strip():
-                        continue
-
-                    dep_version = cells[1].strip('`').strip()
-                    status = cells[2].strip() if len(cells) > 2 else ''
-                    prev_version = cells[3].strip('`').strip() if len(cells) > 3 else ''
-
-                    # Extract artifact name from markdown link if present
-                    link_match = re.match(r'\[([^\]]+)\]', name)
-                    if link_match:
-                        name = link_match.group(1)
-
-                    if name and dep_version:
-                        entries[name] = ChangelogEntry(name, dep_version, status, prev_version, current_category)
-
-        return version, entries
+        return latest.version, latest.entries
 
 
 class VersionComparator:
     """Compare versions and determine change type."""
 
     @staticmethod
-    def parse_version(version: str) -> Tuple[int, ...]:
-        """Parse a version string into a tuple of integers."""
-        try:
-            return tuple(int(x) for x in version.split('.'))
-        except (ValueError, AttributeError):
-            return (0,)
+    def parse_version(version: str) -> maven_version.MavenVersion:
+        """Parse a version string, qualifiers included, in the Maven order."""
+        return maven_version.parse_version(version)
 
     @staticmethod
     def get_status(old_version: str, new_version: str) -> str:
@@ -241,20 +117,18 @@ class VersionComparator:
         old = VersionComparator.parse_version(old_version)
         new = VersionComparator.parse_version(new_version)
 
-        # Pad to same length
-        max_len = max(len(old), len(new))
-        old = old + (0,) * (max_len - len(old))
-        new = new + (0,) * (max_len - len(new))
-
         if new == old:
             return ""
 
+        old_major, old_minor = old.release_components(2)
+        new_major, new_minor = new.release_components(2)
+
         # Check major version (first component)
-        if new[0] > old[0]:
+        if new_major > old_major:
             return "🔴"
 
         # Check minor version (second component)
-        if len(new) > 1 and len(old) > 1 and new[1] > old[1]:
+        if new_minor > old_minor:
             return "🔵"
 
         # Otherwise it's a patch
@@ -264,22 +138,35 @@ class VersionComparator:
 class ChangelogGenerator:
     """Generate new changelog entries."""
 
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, tracer: Optional[timing.Tracer] = None):
         self.filepath = filepath
+        self.tracer = tracer or timing.Tracer(enabled=False)
 
     def generate_new_section(
         self,
         new_version: str,
         dependencies: List[Dependency],
-        old_entries: Dict[str, ChangelogEntry]
+        old_entries: Dict[str, ChangelogEntry],
+        notes: Optional[release_notes.ReleaseNotes] = None
     ) -> Tuple[str, bool]:
-        """Generate a new version section for the changelog."""
+        """
+        Generate a new version section for the changelog.
+        With `notes`, a Notes column summarizes the releases between the previous and the new
+        version of each updated component.
+        """
+        def row(name: str, version: str = "", status: str = "", prev_version: str = "", note: str = "") -> str:
+            line = f"| {name:<47} | {version:^7} | {status:^6} | {prev_version:^16} |"
+            return line + f" {note} |" if notes is not None else line
+
         lines = [
             f"## [{new_version}]",
             "",
             "| Component                                       | Version | Status | Prev.<br>Version |",
             "|:------------------------------------------------|:-------:|:------:|:----------------:|"
         ]
+        if notes is not None:
+            lines[2] += " Notes |"
+            lines[3] += ":------|"
 
         has_changes = False
         current_deps_names = set()
@@ -314,23 +201,26 @@ class ChangelogGenerator:
                             version = f"`{removed.version}`"
                             status = "❌"
                             prev_version = ""
-                            line = f"| {name:<47} | {version:^7} | {status:^6} | {prev_version:^16} |"
-                            lines.append(line)
-                    lines.append("|                                                 |         |        |                  |")
+                            lines.append(row(name, version, status, prev_version))
+                    lines.append(row(""))
 
                 current_category = dep.category
-                lines.append(f"| {current_category:<47} |         |        |                  |")
+                lines.append(row(current_category))
 
             # Determine if there's a change
             old_entry = old_entries.get(dep.artifact_id)
             status = ""
             prev_version = ""
+            note = ""
 
             if old_entry:
                 if old_entry.version != dep.version:
                     status = VersionComparator.get_status(old_entry.version, dep.version)
                     prev_version = f"`{old_entry.version}`"
                     has_changes = True
+                    if notes is not None:
+                        releases = notes.between(dep.group_id, dep.artifact_id, old_entry.version, dep.version)
+                        note = release_notes.summarize(body for _, body in releases)
             else:
                 # New dependency
                 status = "🆕"
@@ -341,8 +231,7 @@ class ChangelogGenerator:
             version = f"`{dep.version}`"
 
             # Build the line with proper alignment
-            line = f"| {name:<47} | {version:^7} | {status:^6} | {prev_version:^16} |"
-            lines.append(line)
+            lines.append(row(name, version, status, prev_version, note))
 
         # Add removed dependencies from last category
         if current_category and current_category in removed_by_category:
@@ -351,21 +240,19 @@ class ChangelogGenerator:
                 version = f"`{removed.version}`"
                 status = "❌"
                 prev_version = ""
-                line = f"| {name:<47} | {version:^7} | {status:^6} | {prev_version:^16} |"
-                lines.append(line)
+                lines.append(row(name, version, status, prev_version))
 
         # Handle removed dependencies from categories that no longer exist
         for category, removed_list in removed_by_category.items():
             if category not in deps_by_category:
-                lines.append("|                                                 |         |        |                  |")
-                lines.append(f"| {category:<47} |         |        |                  |")
+                lines.append(row(""))
+                lines.append(row(category))
                 for removed in removed_list:
                     name = f"[{removed.name}]"
                     version = f"`{removed.version}`"
                     status = "❌"
                     prev_version = ""
-                    line = f"| {name:<47} | {version:^7} | {status:^6} | {prev_version:^16} |"
-                    lines.append(line)
+                    lines.append(row(name, version, status, prev_version))
 
         return "\n".join(lines), has_changes
 
@@ -382,32 +269,55 @@ class ChangelogGenerator:
             print("No changes detected between build.gradle.kts and the latest CHANGELOG version.")
             return False
 
-        with open(self.filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Find the [Unreleased] section
-        unreleased_match = re.search(r'(## \[Unreleased\]\n)', content)
-        if not unreleased_match:
+        inserted = write_atomically(
+            self.filepath,
+            lambda target: self.write_updated_changelog(target, new_version, new_section, dependencies, old_entries)
+        )
+        if not inserted:
             print("Error: Could not find [Unreleased] section in CHANGELOG.md")
             return False
 
-        # Insert new section after [Unreleased]
-        insert_pos = unreleased_match.end()
-        new_content = (
-            content[:insert_pos] +
-            "\n" + new_section + "\n" +
-            content[insert_pos:]
-        )
-
-        # Update reference links
-        new_content = self.update_reference_links(new_content, new_version, dependencies, old_entries)
-
-        with open(self.filepath, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-
         print(f"CHANGELOG.md updated successfully with version {new_version}")
         return True
 
+    def write_updated_changelog(
+        self,
+        target: TextIO,
+        new_version: str,
+        new_section: str,
+        dependencies: List[Dependency],
+        old_entries: Dict[str, ChangelogEntry]
+    ) -> bool:
+        """
+        Stream the CHANGELOG to target with the new section inserted after [Unreleased]
+        and the reference links footer rewritten.
+        Only the footer is held in memory. Returns False if there is no [Unreleased] section.
+        """
+        inserted = False
+        footer: Optional[List[str]] = None
+
+        with open(self.filepath, 'r', encoding='utf-8') as source:
+            for line in source:
+                if inserted and ReferenceLinks.is_footer_start(line):
+                    # The footer starts at the last [Unreleased] compare link
+                    if footer is not None:
+                        target.writelines(footer)
+                    footer = [line]
+                elif footer is not None:
+                    footer.append(line)
+                else:
+                    target.write(line)
+                    if not inserted and line.endswith('## [Unreleased]\n'):
+                        # Insert new section after [Unreleased]
+                        target.write("\n" + new_section + "\n")
+                        inserted = True
+
+        if footer is not None:
+            with self.tracer.span("rewrite reference links", lines=len(footer)):
+                links = ReferenceLinks.parse(''.join(footer))
+                target.write(links.render(new_version, dependencies, old_entries))
+        return inserted
+
     def update_reference_links(
         self,
         content: str,
@@ -416,62 +326,116 @@ class ChangelogGenerator:
         old_entries: Dict[str, ChangelogEntry]
     ) -> str:
         """Update the [Unreleased] and version reference links, and add/remove dependency links."""
-        # Find the reference links section
-        unreleased_link_match = re.search(
-            r'\[Unreleased\]: https://github\.com/([^/]+)/([^/]+)/compare/([\d.]+)\.\.\.HEAD',
-            content
-        )
-
-        if not unreleased_link_match:
+        footer_start = ReferenceLinks.find(content)
+        if footer_start is None:
             return content
+        links = ReferenceLinks.parse(content[footer_start:])
+        return content[:footer_start] + links.render(new_version, dependencies, old_entries)
 
-        org = unreleased_link_match.group(1)
-        repo = unreleased_link_match.group(2)
-        old_version = unreleased_link_match.group(3)
 
-        # Update [Unreleased] link to point from new version to HEAD
-        new_unreleased_link = f"[Unreleased]: https://github.com/{org}/{repo}/compare/{new_version}...HEAD"
-        content = re.sub(
-            r'\[Unreleased\]: https://github\.com/[^/]+/[^/]+/compare/[\d.]+\.\.\.HEAD',
-            new_unreleased_link,
-            content
-        )
+class ReferenceLinks:
+    """
+    Structured model of the reference links footer of the CHANGELOG, starting at the
+    [Unreleased] compare link: the lines before the artifact links (version links), the
+    artifact links, and the lines after them.
+    """
 
-        # Add new version link after [Unreleased] link
-        new_version_link = f"[{new_version}]: https://github.com/{org}/{repo}/compare/{old_version}...{new_version}"
-        content = re.sub(
-            r'(\[Unreleased\]: [^\n]+\n)',
-            f'\\1{new_version_link}\n',
-            content
-        )
+    UNRELEASED_LINK_PATTERN = re.compile(
+        r'\[Unreleased\]: https://github\.com/([^/]+)/([^/]+)/compare/([\d.]+)\.\.\.HEAD'
+    )
+    ARTIFACT_LINK_PATTERN = re.compile(r'\[((?:keypop|keyple)-[^\]]+)\]: ')
+    LINK_PATTERN = re.compile(r'\[([^\]]+)\]: https://github\.com/')
+
+    def __init__(self, head: List[str], artifact_links: Dict[str, str], tail: List[str], has_artifact_links: bool):
+        self.head = head
+        self.artifact_links = artifact_links
+        self.tail = tail
+        self.has_artifact_links = has_artifact_links
+
+    @classmethod
+    def find(cls, content: str) -> Optional[int]:
+        """Return the offset of the [Unreleased] compare link line, or None if there is none."""
+        position = len(content)
+        while True:
+            position = content.rfind('[Unreleased]: ', 0, position)
+            if position < 0:
+                return None
+            if (position == 0 or content[position - 1] == '\n') and \
+                    cls.UNRELEASED_LINK_PATTERN.match(content, position):
+                return position
+
+    @classmethod
+    def is_footer_start(cls, line: str) -> bool:
+        """Check if a line is an [Unreleased] compare link."""
+        return bool(cls.UNRELEASED_LINK_PATTERN.match(line))
+
+    @classmethod
+    def parse(cls, footer: str) -> "ReferenceLinks":
+        """Parse the footer in a single pass over its lines."""
+        head: List[str] = []
+        artifact_links: Dict[str, str] = {}
+        tail: List[str] = []
+        pending: List[str] = []
+        in_artifacts = False
+
+        for line in footer.split('\n'):
+            artifact_match = cls.ARTIFACT_LINK_PATTERN.match(line)
+            if artifact_match:
+                # Lines between two artifact links are dropped, the section is regenerated
+                in_artifacts = True
+                pending = []
+                artifact_links[artifact_match.group(1)] = line
+            elif in_artifacts:
+                pending.append(line)
+            else:
+                head.append(line)
+        if in_artifacts:
+            tail = pending
+        return cls(head, artifact_links, tail, in_artifacts)
 
-        # Find added and removed dependencies
+    def render(
+        self,
+        new_version: str,
+        dependencies: List[Dependency],
+        old_entries: Dict[str, ChangelogEntry]
+    ) -> str:
+        """Render the footer for a new version: compare links, then artifact links in dependency order."""
         current_deps = {dep.artifact_id for dep in dependencies}
-        old_deps = set(old_entries.keys())
+        removed_deps = set(old_entries.keys()) - current_deps
+
+        lines = []
+        for line in self.head:
+            unreleased_match = self.UNRELEASED_LINK_PATTERN.match(line)
+            if unreleased_match and not lines:
+                org, repo, old_version = unreleased_match.groups()
+                lines.append(f"[Unreleased]: https://github.com/{org}/{repo}/compare/{new_version}...HEAD")
+                lines.append(f"[{new_version}]: https://github.com/{org}/{repo}/compare/{old_version}...{new_version}")
+            elif not self._is_removed_link(line, removed_deps):
+                lines.append(line)
 
-        added_deps = current_deps - old_deps
-        removed_deps = old_deps - current_deps
+        if self.has_artifact_links:
+            lines.extend(self.render_artifact_links(dependencies, removed_deps))
+            lines.extend(line for line in self.tail if not self._is_removed_link(line, removed_deps))
+        return '\n'.join(lines)
 
-        # First, remove links for removed dependencies
-        for dep_name in removed_deps:
-            content = re.sub(
-                rf'\n\[{re.escape(dep_name)}\]: https://github\.com/[^\n]+\n',
-                '\n',
-                content
-            )
-
-        # Extract all existing artifact links (keypop and keyple) into a dict
-        existing_links = {}
-        for match in re.finditer(r'\n\[((keypop|keyple)-[^\]]+)\]: ([^\n]+)\n', content):
-            artifact_id = match.group(1)
-            full_line = match.group(0)
-            existing_links[artifact_id] = full_line
+    @staticmethod
+    def artifact_link(artifact_id: str) -> Optional[str]:
+        """Build the releases link of a keypop or keyple artifact."""
+        if artifact_id.startswith('keypop-'):
+            org = 'eclipse-keypop'
+        elif artifact_id.startswith('keyple-'):
+            org = 'eclipse-keyple'
+        else:
+            return None
+        return f"[{artifact_id}]: https://github.com/{org}/{artifact_id}/releases"
 
-        # Build set of all dependencies we're managing
-        managed_deps = set(dep.artifact_id for dep in dependencies)
+    def _is_removed_link(self, line: str, removed_deps: set) -> bool:
+        """Check if a line is the link of a removed dependency."""
+        link_match = self.LINK_PATTERN.match(line)
+        return bool(link_match) and link_match.group(1) in removed_deps
 
-        # Build the new ordered list of links based on dependencies order
-        # Group by category to add blank lines between categories
+    def render_artifact_links(self, dependencies: List[Dependency], removed_deps: set) -> List[str]:
+        """Build the artifact links in dependency order, with a blank line between categories."""
         new_links_section = []
         processed_deps = set()
         previous_category = None
@@ -483,83 +447,409 @@ class ChangelogGenerator:
             if previous_category and dep.category != previous_category:
                 new_links_section.append('')
 
-            if dep.artifact_id in existing_links:
-                # Use existing link (strip the leading \n if present)
-                link = existing_links[dep.artifact_id].lstrip('\n')
-                new_links_section.append(link.rstrip('\n'))
+            if dep.artifact_id in self.artifact_links:
+                new_links_section.append(self.artifact_links[dep.artifact_id])
             else:
                 # Create new link (either because it's a new dependency or the link is missing)
-                if dep.artifact_id.startswith('keypop-'):
-                    org = 'eclipse-keypop'
-                elif dep.artifact_id.startswith('keyple-'):
-                    org = 'eclipse-keyple'
-                else:
+                new_link = self.artifact_link(dep.artifact_id)
+                if new_link is None:
                     continue
-                new_link = f"[{dep.artifact_id}]: https://github.com/{org}/{dep.artifact_id}/releases"
                 new_links_section.append(new_link)
 
             previous_category = dep.category
 
-        # Add any existing links that are not in current dependencies and not removed
+        # Keep the links that are not in current dependencies and not removed
         # (these might be from older versions still referenced in the changelog)
-        orphan_links = []
-        for artifact_id, link_line in existing_links.items():
-            if artifact_id not in processed_deps and artifact_id not in removed_deps:
-                orphan_links.append(link_line.lstrip('\n').rstrip('\n'))
-
+        orphan_links = [
+            link for artifact_id, link in self.artifact_links.items()
+            if artifact_id not in processed_deps and artifact_id not in removed_deps
+        ]
         if orphan_links:
             new_links_section.append('')  # Blank line before orphan links
             new_links_section.extend(orphan_links)
 
-        # Find the artifact links section boundaries
-        first_artifact_link = re.search(r'\n\[(keypop|keyple)-[^\]]+\]: ', content)
-        if first_artifact_link:
-            # Find where artifact links end (before the next section or end of file)
-            links_start = first_artifact_link.start()
-
-            # Find the end of all artifact links
-            last_artifact_link = None
-            for match in re.finditer(r'\n\[(keypop|keyple)-[^\]]+\]: [^\n]+\n', content):
-                last_artifact_link = match
-
-            if last_artifact_link:
-                links_end = last_artifact_link.end()
-
-                # Replace the entire artifact links section with the new ordered one
-                # Join with newlines and add a trailing newline
-                new_links_text = '\n' + '\n'.join(new_links_section) + '\n'
-                content = (
-                    content[:links_start] +
-                    new_links_text +
-                    content[links_end:]
+        return new_links_section
+
+
+def parse_revision(content: str) -> List[Tuple[str, str, str, str]]:
+    """
+    Parse a build.gradle.kts revision in a worker process.
+    Returns (artifact_id, version, category, group_id) tuples, which pickle across processes.
+    """
+    return [
+        (dep.artifact_id, dep.version, dep.category, dep.group_id)
+        for dep in BuildGradleParser.parse_content(content)
+    ]
+
+
+class HistoryBackfill:
+    """
+    Regenerate the CHANGELOG sections of the BOM revisions found in the local git history.
+
+    The revisions are either the YYYY.MM.DD tags, or the commits touching build.gradle.kts
+    (the last commit of each day, versioned by its date). Their build.gradle.kts contents are
+    read with a single `git cat-file --batch` process, parsed in a process pool, and consecutive
+    revisions are compared to build one section per revision with changes.
+    """
+
+    BOM_FILE = "build.gradle.kts"
+
+    def __init__(self, repo_dir: str = ".", jobs: Optional[int] = None):
+        self.repo_dir = repo_dir
+        self.jobs = jobs
+
+    def _git(self, *args: str) -> bytes:
+        """Run a git command and return its output."""
+        return subprocess.run(
+            ["git", *args], cwd=self.repo_dir,
+            stdout=subprocess.PIPE, check=True
+        ).stdout
+
+    def list_revisions(self, source: str) -> List[Tuple[str, str]]:
+        """Return the (version, revision) pairs to backfill, oldest first."""
+        if source == "tags":
+            tags = self._git("tag", "--list").decode('utf-8').split()
+            return [(tag, tag) for tag in sorted(tags) if VERSION_FORMAT_PATTERN.match(tag)]
+
+        log = self._git("log", "--reverse", "--date=short", "--format=%H %cd", "--", self.BOM_FILE)
+        revisions: Dict[str, str] = {}
+        for line in log.decode('utf-8').splitlines():
+            commit, day = line.split()
+            # The last commit of a day wins
+            revisions[day.replace('-', '.')] = commit
+        return sorted(revisions.items())
+
+    def read_revisions(self, revisions: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """Read the build.gradle.kts content of each revision (None if missing) with one git process."""
+        return bom_model.read_git_contents([revision for _, revision in revisions], self.BOM_FILE, self.repo_dir)
+
+    def generate_sections(self, source: str) -> List[Tuple[str, str, List[Dependency]]]:
+        """Return the (version, section, dependencies) of each revision with changes, oldest first."""
+        revisions = self.list_revisions(source)
+        contents = self.read_revisions(revisions)
+        available = [(version, content) for (version, _), content in zip(revisions, contents) if content is not None]
+
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            parsed = list(executor.map(parse_revision, [content for _, content in available], chunksize=8))
+
+        generator = ChangelogGenerator("")
+        sections = []
+        old_entries: Dict[str, ChangelogEntry] = {}
+        for (version, _), rows in zip(available, parsed):
+            dependencies = [Dependency(*row) for row in rows]
+            section, has_changes = generator.generate_new_section(version, dependencies, old_entries)
+            if has_changes:
+                sections.append((version, section, dependencies))
+            old_entries = {
+                dep.artifact_id: ChangelogEntry(dep.artifact_id, dep.version, "", "", dep.category)
+                for dep in dependencies
+            }
+        return sections
+
+    def write(self, output: str, sections: List[Tuple[str, str, List[Dependency]]],
+              repository: str = DEFAULT_REPOSITORY) -> None:
+        """Write all the sections, newest first, with their reference links, in a single atomic write."""
+        lines = [
+            "# Changelog",
+            "",
+            "## [Unreleased]",
+            "",
+        ]
+        for _, section, _ in reversed(sections):
+            lines.append(section)
+            lines.append("")
+
+        versions = [version for version, _, _ in sections]
+        if versions:
+            lines.append(f"[Unreleased]: https://github.com/{repository}/compare/{versions[-1]}...HEAD")
+            for i in range(len(versions) - 1, 0, -1):
+                lines.append(
+                    f"[{versions[i]}]: https://github.com/{repository}/compare/{versions[i - 1]}...{versions[i]}"
                 )
+            lines.append(f"[{versions[0]}]: https://github.com/{repository}/releases/tag/{versions[0]}")
+
+            # Links of the latest dependencies first, then of the ones removed over time
+            all_links = {}
+            for _, _, dependencies in sections:
+                for dep in dependencies:
+                    link = ReferenceLinks.artifact_link(dep.artifact_id)
+                    if link is not None:
+                        all_links[dep.artifact_id] = link
+            links = ReferenceLinks([], all_links, [], True)
+            lines.append("")
+            lines.extend(links.render_artifact_links(sections[-1][2], set()))
+
+        def write_lines(target: TextIO) -> bool:
+            target.write('\n'.join(lines) + '\n')
+            return True
+
+        write_atomically(output, write_lines)
+
+
+class PreviewWatcher:
+    """
+    Keep the next CHANGELOG section up to date in a preview file while build.gradle.kts and
+    CHANGELOG.md are edited.
+
+    Both files are polled by mtime/size. The BOM model and the latest CHANGELOG entries stay in
+    memory: a modified CHANGELOG.md is indexed again, a modified build.gradle.kts is parsed again
+    and compared constraint by constraint with the previous model. The section is generated and
+    the preview written only when a constraint or the CHANGELOG entries changed.
+    """
+
+    def __init__(self, version: str, bom_path: str = "build.gradle.kts", changelog_path: str = "CHANGELOG.md",
+                 preview_path: str = DEFAULT_PREVIEW, interval: float = DEFAULT_POLL_INTERVAL,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.version = version
+        self.bom_path = bom_path
+        self.changelog_path = changelog_path
+        self.preview_path = preview_path
+        self.interval = interval
+        self.sleep = sleep
+        self.generator = ChangelogGenerator(changelog_path)
+        self.signatures: Dict[str, Optional[Tuple[int, int]]] = {bom_path: None, changelog_path: None}
+        self.model: Optional[bom_model.BomModel] = None
+        self.old_version: Optional[str] = None
+        self.old_entries: Dict[str, ChangelogEntry] = {}
+        self.preview: Optional[str] = None
 
-        return content
+    @staticmethod
+    def signature(path: str) -> Optional[Tuple[int, int]]:
+        """Return the (mtime, size) of a file, or None if it does not exist."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def modified(self, path: str) -> bool:
+        """Return True if a file changed since the last call, and remember its signature."""
+        signature = self.signature(path)
+        if signature is None or signature == self.signatures[path]:
+            return False
+        self.signatures[path] = signature
+        return True
+
+    def reload_changelog(self) -> bool:
+        """Index CHANGELOG.md again; returns True if its latest entries changed."""
+        old_version, old_entries = ChangelogParser(self.changelog_path).parse_latest_version()
+        if (old_version, old_entries) == (self.old_version, self.old_entries):
+            return False
+        self.old_version, self.old_entries = old_version, old_entries
+        print(f"  {self.changelog_path}: latest version {old_version or 'none'}")
+        return True
+
+    def reload_bom(self) -> bool:
+        """Parse build.gradle.kts again; returns True if one of its constraints changed."""
+        with open(self.bom_path, 'r', encoding='utf-8') as f:
+            model = bom_model.parse_bom_content(f.read())
+        previous = {c.artifact_id: c for c in self.model.constraints} if self.model else None
+        self.model = model
+        if previous is None:
+            print(f"  {self.bom_path}: {len(model.libraries)} dependencies")
+            return True
+
+        changed = False
+        for constraint in model.constraints:
+            before = previous.pop(constraint.artifact_id, None)
+            if before is None:
+                print(f"  {self.bom_path}:{constraint.line_number}: added {constraint.coordinates}")
+            elif before.version != constraint.version:
+                print(f"  {self.bom_path}:{constraint.line_number}: "
+                      f"{constraint.artifact_id} {before.version} → {constraint.version}")
+            elif before.category != constraint.category:
+                print(f"  {self.bom_path}:{constraint.line_number}: "
+                      f"{constraint.artifact_id} moved to {constraint.category}")
+            else:
+                continue
+            changed = True
+        for removed in previous.values():
+            print(f"  {self.bom_path}: removed {removed.coordinates}")
+            changed = True
+        return changed
+
+    def refresh(self) -> bool:
+        """Reload the modified files and rewrite the preview if needed; returns True if it was rewritten."""
+        changed = False
+        try:
+            if self.modified(self.changelog_path):
+                changed = self.reload_changelog() or changed
+            if self.modified(self.bom_path):
+                changed = self.reload_bom() or changed
+        except (OSError, UnicodeDecodeError) as e:
+            # The file may be in the middle of a save, it is read again on its next change
+            print(f"  Could not read the files: {e}")
+            return False
+        if not changed or self.model is None:
+            return False
+
+        dependencies = BuildGradleParser.to_dependencies(self.model)
+        section, has_changes = self.generator.generate_new_section(self.version, dependencies, self.old_entries)
+        if has_changes:
+            preview = section + "\n"
+        else:
+            preview = f"No changes between {self.bom_path} and the latest CHANGELOG version ({self.old_version}).\n"
+        if preview == self.preview:
+            return False
+
+        def write_preview(target: TextIO) -> bool:
+            target.write(preview)
+            return True
+
+        write_atomically(self.preview_path, write_preview)
+        self.preview = preview
+        print(f"  {time.strftime('%H:%M:%S')} {self.preview_path} updated")
+        return True
+
+    def run(self) -> None:
+        """Poll the files until interrupted."""
+        print(f"Watching {self.bom_path} and {self.changelog_path} (preview: {self.preview_path}, "
+              f"version {self.version}), press Ctrl+C to stop...")
+        try:
+            while True:
+                self.refresh()
+                self.sleep(self.interval)
+        except KeyboardInterrupt:
+            print("Stopped.")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Update CHANGELOG.md from build.gradle.kts changes.")
+    parser.add_argument("version", nargs="?", help="new version, YYYY.MM.DD (default: today)")
+    parser.add_argument(
+        "--backfill",
+        choices=["tags", "commits"],
+        help="regenerate the sections of all the BOM revisions of the git history, "
+             "taken from the YYYY.MM.DD tags or from the commits touching build.gradle.kts"
+    )
+    parser.add_argument(
+        "--output",
+        default="CHANGELOG.backfill.md",
+        help="file written by --backfill (default: CHANGELOG.backfill.md)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="number of processes parsing the revisions in --backfill mode (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep a preview of the next section up to date while build.gradle.kts and CHANGELOG.md are edited"
+    )
+    parser.add_argument(
+        "--preview",
+        default=DEFAULT_PREVIEW,
+        help=f"file written by --watch (default: {DEFAULT_PREVIEW})"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=f"seconds between two checks of the files in --watch mode (default: {DEFAULT_POLL_INTERVAL})"
+    )
+    parser.add_argument(
+        "--notes",
+        nargs="?",
+        const=release_notes.DEFAULT_NOTES_FILE,
+        metavar="FILE",
+        help="add a Notes column summarizing the release notes collected by check_versions.py --release-notes "
+             f"(default: {release_notes.DEFAULT_NOTES_FILE})"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="write the timings of the phases to FILE as a Chrome trace"
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="print a summary table of the phase timings"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="run under cProfile and dump the statistics to FILE"
+    )
+    return parser.parse_args()
+
+
+def backfill(args: argparse.Namespace) -> None:
+    """Regenerate the history sections from git into args.output."""
+    print(f"Backfilling CHANGELOG sections from git {args.backfill}...")
+    history = HistoryBackfill(jobs=args.jobs)
+    try:
+        sections = history.generate_sections(args.backfill)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Error: Could not read the git history: {e}")
+        sys.exit(1)
+
+    if not sections:
+        print("No BOM revision found in the git history.")
+        sys.exit(1)
+
+    repository = DEFAULT_REPOSITORY
+    if os.path.exists("CHANGELOG.md"):
+        with open("CHANGELOG.md", 'r', encoding='utf-8') as f:
+            for line in f:
+                unreleased_match = ReferenceLinks.UNRELEASED_LINK_PATTERN.match(line)
+                if unreleased_match:
+                    repository = f"{unreleased_match.group(1)}/{unreleased_match.group(2)}"
+
+    history.write(args.output, sections, repository)
+    print(f"{len(sections)} sections written to {args.output} "
+          f"({sections[0][0]} to {sections[-1][0]})")
 
 
 def main():
     """Main entry point."""
-    # Determine version
-    if len(sys.argv) > 1:
-        new_version = sys.argv[1]
+    args = parse_args()
+    tracer = timing.Tracer(enabled=bool(args.trace or args.timings))
+    try:
+        with timing.profiled(args.profile):
+            if args.backfill:
+                with tracer.span("backfill"):
+                    backfill(args)
+                sys.exit(0)
+            if args.watch:
+                PreviewWatcher(resolve_version(args), preview_path=args.preview, interval=args.interval).run()
+                sys.exit(0)
+            update(args, tracer)
+    finally:
+        timing.report(tracer, args.trace, args.timings)
+
+
+def resolve_version(args: argparse.Namespace) -> str:
+    """Return the version given on the command line, or today's date; exit if it is invalid."""
+    if args.version:
+        new_version = args.version
         # Validate format
-        if not re.match(r'^\d{4}\.\d{2}\.\d{2}$', new_version):
+        if not VERSION_FORMAT_PATTERN.match(new_version):
             print(f"Error: Invalid version format '{new_version}'. Expected YYYY.MM.DD")
             sys.exit(1)
     else:
         today = date.today()
         new_version = today.strftime("%Y.%m.%d")
+    return new_version
+
+
+def update(args: argparse.Namespace, tracer: timing.Tracer) -> None:
+    """Add the section of the new version to CHANGELOG.md, then exit with its status."""
+    new_version = resolve_version(args)
 
     print(f"Updating CHANGELOG.md for version {new_version}...")
 
     # Parse build.gradle.kts
     gradle_parser = BuildGradleParser("build.gradle.kts")
-    dependencies = gradle_parser.parse()
+    with tracer.span("parse build.gradle.kts"):
+        dependencies = gradle_parser.parse()
     print(f"Found {len(dependencies)} dependencies in build.gradle.kts")
 
     # Parse CHANGELOG.md
     changelog_parser = ChangelogParser("CHANGELOG.md")
-    old_version, old_entries = changelog_parser.parse_latest_version()
+    with tracer.span("parse CHANGELOG.md"):
+        old_version, old_entries = changelog_parser.parse_latest_version()
     if old_version:
         print(f"Latest CHANGELOG version: {old_version}")
     else:
@@ -571,14 +861,24 @@ def main():
         print(f"Version {new_version} already exists in CHANGELOG.md. No changes needed.")
         sys.exit(0)
 
+    notes = None
+    if args.notes:
+        try:
+            notes = release_notes.ReleaseNotes.load(args.notes)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read the release notes: {e}")
+            sys.exit(1)
+
     # Generate new section
-    generator = ChangelogGenerator("CHANGELOG.md")
-    new_section, has_changes = generator.generate_new_section(
-        new_version, dependencies, old_entries
-    )
+    generator = ChangelogGenerator("CHANGELOG.md", tracer)
+    with tracer.span("generate section"):
+        new_section, has_changes = generator.generate_new_section(
+            new_version, dependencies, old_entries, notes
+        )
 
     # Update changelog
-    success = generator.update_changelog(new_version, new_section, has_changes, dependencies, old_entries)
+    with tracer.span("write CHANGELOG.md"):
+        success = generator.update_changelog(new_version, new_section, has_changes, dependencies, old_entries)
 
     sys.exit(0 if success else 1)
 